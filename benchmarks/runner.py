@@ -0,0 +1,47 @@
+"""
+Measures the per-task overhead of `miscellaneous.Runner` from 1k to 1M tasks.
+
+    python benchmarks/runner.py [max_tasks ...] > bench_output.txt
+
+Every task is a no-op coroutine, so the numbers are the cost of push, completion
+bookkeeping and the result drain alone. They should stay flat as the count grows.
+"""
+import asyncio
+import importlib
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT.parent))
+Runner = importlib.import_module(f'{ROOT.name}.miscellaneous').Runner
+
+COUNTS = (1_000, 10_000, 100_000, 1_000_000)
+
+async def noop(i: int) -> int:
+    return i
+
+async def bench(count: int, max_tasks: int|None) -> tuple[float, float]:
+    runner = Runner(name='bench', loop=asyncio.get_running_loop(), max_tasks=max_tasks)
+    runner.finish_delay = 0
+
+    start = time.perf_counter()
+    for i in range(count):
+        runner.push(noop(i))
+    pushed = time.perf_counter()
+
+    results = await runner.run()
+    done = time.perf_counter()
+
+    assert len(results) == count, len(results)
+    return pushed - start, done - pushed
+
+def main(counts: tuple[int, ...]) -> None:
+    print(f'{"tasks":>10} {"max_tasks":>10} {"push us/task":>13} {"run us/task":>12} {"total s":>9}')
+    for max_tasks in (None, 100):
+        for count in counts:
+            push, run = asyncio.run(bench(count, max_tasks))
+            print(f'{count:>10} {str(max_tasks):>10} {push / count * 1e6:>13.2f} {run / count * 1e6:>12.2f} {push + run:>9.2f}', flush=True)
+
+if __name__ == '__main__':
+    main(tuple(int(n) for n in sys.argv[1:]) or COUNTS)
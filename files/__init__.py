@@ -1,7 +1,22 @@
-from.io import read, write, read_csv, write_csv, readlines, read_bin, write_bin
-from.paths import UnsafePathException, join_paths
+from.io import read, write, read_csv, write_csv, readlines, read_bin, write_bin, iter_read, iter_lines, iter_chunks, iter_csv, unique_rows, MappedFile, iter_lines_reverse, tail
+from.paths import UnsafePathException, join_paths, join_paths_many, clear_paths_cache
+from.compression import open_file
+from.cache import ReadCache, get_read_cache
+from.atomic import GroupSync, durable_open, flush_group
+from.columnar import read_csv_columns
+from.parallel import read_csv_parallel, iter_csv_parallel
+from.writers import CsvAppender, PartitionedWriter
+from.tailer import CsvTailer
+from.merge import merge_csv, iter_merge_csv
+from.arrow import csv_to_arrow, write_arrow, read_arrow, read_csv_arrow
+from.index import CsvIndex, read_csv_range, iter_csv_range
+from.transfer import copy, move, copy_many, copy_tree
+from.aio import aread, awrite, aread_csv, awrite_csv, aread_bin, awrite_bin, aiter_lines, aiter_chunks, aiter_csv
 
-__all__ = ['read', 'write', 'read_csv', 'write_csv', 'join_paths', 'readlines', 'read_bin', 'write_bin']
+__all__ = ['read', 'write', 'read_csv', 'write_csv', 'join_paths', 'join_paths_many', 'clear_paths_cache', 'readlines', 'read_bin', 'write_bin', 'iter_read', 'iter_lines', 'iter_chunks', 'iter_csv', 'unique_rows', 'MappedFile', 'iter_lines_reverse', 'tail', 'open_file', 'ReadCache', 'get_read_cache', 'GroupSync', 'durable_open', 'flush_group', 'read_csv_columns', 'read_csv_parallel', 'iter_csv_parallel', 'CsvAppender', 'PartitionedWriter', 'CsvTailer', 'CsvIndex', 'read_csv_range', 'iter_csv_range', 'merge_csv', 'iter_merge_csv',
+           'csv_to_arrow', 'write_arrow', 'read_arrow', 'read_csv_arrow',
+           'copy', 'move', 'copy_many', 'copy_tree',
+           'aread', 'awrite', 'aread_csv', 'awrite_csv', 'aread_bin', 'awrite_bin', 'aiter_lines', 'aiter_chunks', 'aiter_csv']
 
 
 
@@ -0,0 +1,153 @@
+import asyncio
+import csv
+import os
+from concurrent.futures import ThreadPoolExecutor
+from collections.abc import AsyncIterable, AsyncIterator, Callable, Iterable, Iterator
+from functools import partial
+from itertools import islice
+from pathlib import Path
+from typing import Any, List, Optional, Tuple, Union
+
+from .io import read, write, read_csv, write_csv, read_bin, write_bin, iter_lines, iter_chunks, iter_csv
+from .atomic import GroupSync, durable_open
+from..miscellaneous import check_async_iterable, convert_iter
+
+__all__ = [
+    'aread', 'awrite', 'aread_csv', 'awrite_csv', 'aread_bin', 'awrite_bin',
+    'aiter_lines', 'aiter_chunks', 'aiter_csv', 'run_io', 'set_io_workers'
+]
+
+IO_WORKERS = int(os.getenv('IO_WORKERS', 8))
+IO_BATCH_SIZE = int(os.getenv('IO_BATCH_SIZE', 1024))
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+def get_executor() -> ThreadPoolExecutor:
+    """ Returns the thread pool shared by every async file operation."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(IO_WORKERS, thread_name_prefix='files-io')
+    return _executor
+
+def set_io_workers(max_workers: int) -> None:
+    """ Replaces the shared thread pool by one with `max_workers` threads."""
+    global _executor
+    old, _executor = _executor, ThreadPoolExecutor(max_workers, thread_name_prefix='files-io')
+    if old:
+        old.shutdown(wait=False)
+
+async def run_io(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """ Runs a blocking function in the shared thread pool without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(), partial(func, *args, **kwargs))
+
+async def aread(path: Union[str, Path], **kwargs: Any) -> Union[str, bytes, List[str]]:
+    """ Async counterpart of `read`, accepts the same arguments."""
+    return await run_io(read, path, **kwargs)
+
+async def awrite(path: Union[str, Path], content: Union[str, bytes, Iterable[str]], **kwargs: Any) -> Union[Path, None]:
+    """ Async counterpart of `write`, accepts the same arguments."""
+    return await run_io(write, path, content, **kwargs)
+
+async def aread_bin(path: Union[str, Path], **kwargs: Any) -> bytes:
+    """ Async counterpart of `read_bin`, accepts the same arguments."""
+    return await run_io(read_bin, path, **kwargs)
+
+async def awrite_bin(path: Union[str, Path], content: bytes, **kwargs: Any) -> None:
+    """ Async counterpart of `write_bin`, accepts the same arguments."""
+    return await run_io(write_bin, path, content, **kwargs)
+
+async def aread_csv(path: Union[str, Path], **kwargs: Any) -> List[Optional[Union[List[str], Tuple[str]]]]:
+    """ Async counterpart of `read_csv`, accepts the same arguments."""
+    return await run_io(read_csv, path, **kwargs)
+
+async def awrite_csv(
+    path: Union[str, Path],
+    rows: Union[Iterable[Iterable[str]], AsyncIterable[Iterable[str]]],
+    mode: str = 'w',
+    delimiter: str = ',',
+    encoding: str = 'utf-8',
+    newline: str = '',
+    header: Optional[Iterable[str]] = None,
+    atomic: bool = False,
+    durability: Union[str, GroupSync, None] = None,
+    batch_size: int = IO_BATCH_SIZE,
+    **kwargs: Any
+) -> Path:
+    """
+    Async counterpart of `write_csv`.
+
+    `rows` may also be an async iterable, it is consumed in batches of `batch_size` rows
+    and the next batch is only pulled after the previous one is written. The file is opened
+    with `durable_open` either way, so `atomic` and `durability` behave as in `write_csv`.
+
+    Returns:
+        Path: The path of the written file.
+    """
+    if not check_async_iterable(rows):
+        return await run_io(
+            write_csv, path, rows, mode=mode, delimiter=delimiter, encoding=encoding,
+            newline=newline, header=header, atomic=atomic, durability=durability, **kwargs
+        )
+
+    context = durable_open(path, mode, atomic, durability, encoding=encoding, newline=newline, **kwargs)
+    f = await run_io(context.__enter__)
+    try:
+        writer = csv.writer(f, delimiter=delimiter)
+        if header:
+            await run_io(writer.writerow, header)
+
+        batch = []
+        async for row in rows:
+            batch.append(row)
+            if len(batch) >= batch_size:
+                await run_io(writer.writerows, convert_iter(batch))
+                batch = []
+
+        if batch:
+            await run_io(writer.writerows, convert_iter(batch))
+    except BaseException as e:
+        if not await run_io(context.__exit__, type(e), e, e.__traceback__):
+            raise
+    else:
+        await run_io(context.__exit__, None, None, None)
+
+    return Path(path)
+
+def aiter_lines(path: Union[str, Path], batch_size: int = IO_BATCH_SIZE, **kwargs: Any) -> AsyncIterator[str]:
+    """ Async counterpart of `iter_lines`, reads `batch_size` lines per thread hop."""
+    return _aiter(iter_lines(path, **kwargs), batch_size)
+
+def aiter_chunks(path: Union[str, Path], batch_size: int = 1, **kwargs: Any) -> AsyncIterator[Union[str, bytes]]:
+    """ Async counterpart of `iter_chunks`, reads `batch_size` chunks per thread hop."""
+    return _aiter(iter_chunks(path, **kwargs), batch_size)
+
+def aiter_csv(path: Union[str, Path], batch_size: int = IO_BATCH_SIZE, **kwargs: Any) -> AsyncIterator[Union[List[str], Tuple[str]]]:
+    """ Async counterpart of `iter_csv`, parses `batch_size` rows per thread hop."""
+    return _aiter(iter_csv(path, **kwargs), batch_size)
+
+async def _aiter(iterator: Iterator[Any], batch_size: int) -> AsyncIterator[Any]:
+    """
+    Pulls the next batch only when the consumer asks for it, so reading never runs ahead.
+
+    The batch in flight is shielded from cancellation and awaited before the iterator is closed,
+    a generator cannot be closed while another thread is still running it.
+    """
+    loop = asyncio.get_running_loop()
+    pending = None
+    try:
+        while True:
+            pending = loop.run_in_executor(get_executor(), _next_batch, iterator, batch_size)
+            batch = await asyncio.shield(pending)
+            pending = None
+            if not batch:
+                break
+            for item in batch:
+                yield item
+    finally:
+        if pending is not None:
+            await asyncio.wait([pending])
+        await run_io(iterator.close)
+
+def _next_batch(iterator: Iterator[Any], batch_size: int) -> List[Any]:
+    return list(islice(iterator, batch_size))
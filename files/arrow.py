@@ -0,0 +1,258 @@
+import json
+import os
+from collections.abc import Iterable
+from itertools import islice
+from pathlib import Path
+from typing import IO, Any, List, Optional, Union
+
+from .io import iter_csv
+from .atomic import durable_open
+from .compression import get_compression
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+__all__ = ['csv_to_arrow', 'write_arrow', 'read_arrow', 'read_csv_arrow', 'to_rows']
+
+FORMATS = ('arrow', 'parquet')
+_SOURCE_KEY = b'utils.source'
+
+def csv_to_arrow(
+    path: Union[str, Path],
+    output: Optional[Union[str, Path]] = None,
+    format: Optional[str] = None,
+    delimiter: str = ',',
+    encoding: str = 'utf-8',
+    header: bool = True,
+    infer_types: bool = False,
+    block_size: Optional[int] = None,
+) -> Path:
+    """
+    Converts a CSV file to Arrow IPC or Parquet, streaming it batch by batch.
+
+    The `(st_mtime_ns, st_size)` of the CSV file and the conversion options are stored in
+    the schema metadata, so `read_csv_arrow` knows which sidecar matches which call.
+
+    Args:
+        path (Union[str, Path]): The CSV file to convert.
+        output (Optional[Union[str, Path]], optional): The file to write, `<path>.arrow` or
+            `<path>.parquet` by default. Defaults to None.
+        format (Optional[str], optional): 'arrow' or 'parquet', inferred from the suffix of `output`
+            when None. Defaults to None.
+        delimiter (str, optional): The character used to separate fields. Defaults to ','.
+        encoding (str, optional): Encoding of the CSV file. Defaults to 'utf-8'.
+        header (bool, optional): If True, the first row holds the column names,
+            otherwise columns are named f0, f1... Defaults to True.
+        infer_types (bool, optional): If True, lets Arrow infer the column types, otherwise every
+            column is a string as returned by `read_csv`. Defaults to False.
+        block_size (Optional[int], optional): The number of bytes parsed per batch. Defaults to None.
+
+    Returns:
+        Path: The path of the written file.
+
+    Raises:
+        ImportError: If pyarrow is not installed.
+    """
+    _require()
+    format = format or (_get_format(output) if output else 'arrow')
+    output = Path(output) if output else Path(path).with_name(f'{Path(path).name}.{format}')
+
+    source = _source_stamp(path, delimiter, encoding, header, infer_types)
+    names = next(iter_csv(path, delimiter=delimiter, encoding=encoding), [])
+    read_options = pa_csv.ReadOptions(encoding=encoding, **({'block_size': block_size} if block_size else {}))
+    convert_options = pa_csv.ConvertOptions()
+
+    if not header:
+        names = [f'f{i}' for i in range(len(names))]
+        read_options.column_names = names
+
+    if not infer_types:
+        convert_options.column_types = {name: pa.string() for name in names}
+        convert_options.strings_can_be_null = False
+
+    reader = pa_csv.open_csv(
+        path,
+        read_options=read_options,
+        parse_options=pa_csv.ParseOptions(delimiter=delimiter, newlines_in_values=True),
+        convert_options=convert_options,
+    )
+
+    schema = reader.schema.with_metadata({_SOURCE_KEY: source})
+    with durable_open(output, 'wb', atomic=True) as f, _open_writer(f, format, schema) as writer:
+        for batch in reader:
+            writer.write_batch(batch)
+
+    return output
+
+def write_arrow(
+    path: Union[str, Path],
+    rows: Iterable[Iterable[Any]],
+    header: Optional[Iterable[str]] = None,
+    format: Optional[str] = None,
+    batch_size: int = 65536,
+) -> Path:
+    """
+    Writes rows, as accepted by `write_csv`, to an Arrow IPC or Parquet file.
+
+    Every column is a string column and values are stored as `write_csv` writes them,
+    None as ''. All rows must have as many fields as the first row or the header.
+
+    Args:
+        path (Union[str, Path]): The file to write.
+        rows (Iterable[Iterable[Any]]): The rows to write.
+        header (Optional[Iterable[str]], optional): The column names, f0, f1... if None. Defaults to None.
+        format (Optional[str], optional): 'arrow' or 'parquet', inferred from the suffix when None. Defaults to None.
+        batch_size (int, optional): The number of rows converted per record batch. Defaults to 65536.
+
+    Returns:
+        Path: The path of the written file.
+
+    Raises:
+        ImportError: If pyarrow is not installed.
+        ValueError: If a row has a different number of fields.
+    """
+    _require()
+    path = Path(path)
+    format = format or _get_format(path)
+    rows = iter(rows)
+    names = list(header) if header else None
+    writer = None
+    count = 0
+
+    with durable_open(path, 'wb', atomic=True) as f:
+        try:
+            while batch := [list(row) for row in islice(rows, batch_size)]:
+                names = names or [f'f{i}' for i in range(len(batch[0]))]
+                for row in batch:
+                    count += 1
+                    if len(row) != len(names):
+                        raise ValueError(f'Row {count} has {len(row)} fields, expected {len(names)}.')
+
+                if writer is None:
+                    schema = pa.schema([(name, pa.string()) for name in names])
+                    writer = _open_writer(f, format, schema)
+
+                columns = [['' if v is None else str(v) for v in col] for col in zip(*batch)]
+                writer.write_batch(pa.record_batch(columns, schema=schema))
+
+            if writer is None:
+                writer = _open_writer(f, format, pa.schema([(name, pa.string()) for name in names or []]))
+        finally:
+            if writer is not None:
+                writer.close()
+
+    return path
+
+def read_arrow(
+    path: Union[str, Path],
+    columns: Optional[List[str]] = None,
+    memory_map: bool = True,
+) -> 'pa.Table':
+    """
+    Reads an Arrow IPC or Parquet file into a `pyarrow.Table`.
+
+    Arrow IPC files are memory mapped, so the table references the file pages
+    without copying them into the process memory.
+
+    Args:
+        path (Union[str, Path]): The file to read.
+        columns (Optional[List[str]], optional): Only reads these columns. Defaults to None.
+        memory_map (bool, optional): If True, memory maps the file. Defaults to True.
+
+    Returns:
+        pa.Table: The table.
+
+    Raises:
+        ImportError: If pyarrow is not installed.
+    """
+    _require()
+    if _get_format(path) == 'parquet':
+        return pq.read_table(path, columns=columns, memory_map=memory_map)
+
+    source = pa.memory_map(str(path)) if memory_map else pa.OSFile(str(path))
+    table = pa.ipc.open_file(source).read_all()
+    return table.select(columns) if columns else table
+
+def read_csv_arrow(
+    path: Union[str, Path],
+    format: str = 'arrow',
+    columns: Optional[List[str]] = None,
+    as_rows: bool = False,
+    delimiter: str = ',',
+    encoding: str = 'utf-8',
+    header: bool = True,
+    infer_types: bool = False,
+    **kwargs
+) -> Union['pa.Table', List[List[Any]]]:
+    """
+    Reads a CSV file through an Arrow sidecar, `<path>.arrow` or `<path>.parquet`.
+
+    The sidecar is (re)built with `csv_to_arrow` unless it was converted from the current
+    `(st_mtime_ns, st_size)` of the CSV file with the same options, later calls only map it,
+    which is much faster than parsing the CSV again.
+
+    Args:
+        path (Union[str, Path]): The CSV file to read.
+        format (str, optional): The sidecar format, 'arrow' or 'parquet'. Defaults to 'arrow'.
+        columns (Optional[List[str]], optional): Only reads these columns. Defaults to None.
+        as_rows (bool, optional): If True, returns a list of rows like `read_csv`, without the header. Defaults to False.
+        delimiter (str, optional): The character used to separate fields. Defaults to ','.
+        encoding (str, optional): Encoding of the CSV file. Defaults to 'utf-8'.
+        header (bool, optional): If True, the first row holds the column names. Defaults to True.
+        infer_types (bool, optional): If True, lets Arrow infer the column types. Defaults to False.
+        **kwargs: Additional arguments passed to `csv_to_arrow`.
+
+    Returns:
+        Union[pa.Table, List[List[Any]]]: The table, or its rows.
+    """
+    _require()
+    if format not in FORMATS:
+        raise ValueError(f'Invalid format {format!r}, expected one of {FORMATS}.')
+
+    path = Path(path)
+    sidecar = path.with_name(f'{path.name}.{format}')
+
+    options = dict(delimiter=delimiter, encoding=encoding, header=header, infer_types=infer_types)
+    if _read_source(sidecar, format) != _source_stamp(path, **options):
+        csv_to_arrow(path, sidecar, format, **options, **kwargs)
+
+    table = read_arrow(sidecar, columns)
+    return to_rows(table) if as_rows else table
+
+def to_rows(table: 'pa.Table') -> List[List[Any]]:
+    """ Converts a table to a list of rows."""
+    return [list(row) for row in zip(*(column.to_pylist() for column in table.columns))]
+
+def _source_stamp(path: Union[str, Path], delimiter: str, encoding: str, header: bool, infer_types: bool) -> bytes:
+    st = os.stat(path)
+    return json.dumps([st.st_mtime_ns, st.st_size, delimiter, encoding, header, infer_types]).encode()
+
+def _read_source(path: Path, format: str) -> Optional[bytes]:
+    """ Returns the source stamp stored by `csv_to_arrow`, None if the file is missing or unreadable."""
+    try:
+        if format == 'parquet':
+            schema = pq.read_schema(path)
+        else:
+            with pa.memory_map(str(path)) as source:
+                schema = pa.ipc.open_file(source).schema
+    except (OSError, pa.ArrowInvalid):
+        return None
+    return (schema.metadata or {}).get(_SOURCE_KEY)
+
+def _open_writer(sink: IO, format: str, schema: 'pa.Schema'):
+    if format == 'parquet':
+        return pq.ParquetWriter(sink, schema)
+    return pa.ipc.new_file(sink, schema)
+
+def _get_format(path: Union[str, Path]) -> str:
+    if get_compression(path):
+        raise ValueError(f'Arrow files handle their own compression: {path}')
+    return 'parquet' if Path(path).suffix.lower() in ('.parquet', '.pq') else 'arrow'
+
+def _require() -> None:
+    if pa is None:
+        raise ImportError('Please install the pyarrow package to use this function.')
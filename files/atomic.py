@@ -0,0 +1,234 @@
+import atexit
+import os
+import threading
+import weakref
+from contextlib import contextmanager
+from collections.abc import Iterator
+from pathlib import Path
+from typing import IO, List, Optional, Union
+
+from .compression import open_file, get_compression
+from..miscellaneous import os_is_windows
+
+__all__ = ['GroupSync', 'durable_open', 'fsync_dir', 'flush_group']
+
+GROUP_MAX_FILES = int(os.getenv('GROUP_MAX_FILES', 128))
+GROUP_MAX_DELAY = float(os.getenv('GROUP_MAX_DELAY', 0.05))
+
+_groups: 'weakref.WeakSet[GroupSync]' = weakref.WeakSet()
+
+def fsync_dir(path: Union[str, Path]) -> None:
+    """ Flushes a directory entry to disk, so renames inside it survive a crash. No-op on Windows."""
+    if os_is_windows():
+        return
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+class GroupSync:
+    """
+    Durability policy that batches the fsync of many writes into a single commit.
+
+    Files written with this policy are committed every `max_files` files or `max_delay`
+    seconds after the first pending one, whichever comes first. Writes are visible at once,
+    atomic writes replace their target immediately, only the fsyncs of the files and their
+    directories are deferred, so a crash before the commit may lose the latest writes.
+    Call `flush` to commit immediately, pending files are also committed at exit.
+    A commit that failed in the background is raised by the next `add` or `flush`.
+    """
+    def __init__(self, max_files: int = GROUP_MAX_FILES, max_delay: Optional[float] = GROUP_MAX_DELAY) -> None:
+        self.max_files = max_files
+        self.max_delay = max_delay
+        self._pending: List[Path] = []
+        self._error: Optional[BaseException] = None
+        self._lock = threading.Lock()
+        self._commit_lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+        _groups.add(self)
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def add(self, target: Union[str, Path]) -> None:
+        """ Schedules `target` and its directory to be synced."""
+        self._raise_error()
+        with self._lock:
+            self._pending.append(Path(target))
+
+            if len(self._pending) < self.max_files:
+                if self._timer is None and self.max_delay is not None:
+                    self._timer = threading.Timer(self.max_delay, self._flush_background)
+                    self._timer.daemon = True
+                    self._timer.start()
+                return
+
+            batch = self._take()
+
+        self._commit(batch)
+
+    def flush(self) -> None:
+        """ Commits every pending file now."""
+        self._raise_error()
+        with self._lock:
+            batch = self._take()
+        self._commit(batch)
+
+    def _flush_background(self) -> None:
+        try:
+            self.flush()
+        except BaseException as e:
+            self._error = e
+
+    def _raise_error(self) -> None:
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def _take(self) -> List[Path]:
+        batch, self._pending = self._pending, []
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+        return batch
+
+    def _commit(self, batch: List[Path]) -> None:
+        if not batch:
+            return
+
+        with self._commit_lock:
+            for target in batch:
+                try:
+                    _fsync_path(target)
+                except FileNotFoundError:
+                    pass
+
+            for directory in {target.parent for target in batch}:
+                fsync_dir(directory)
+
+@atexit.register
+def _flush_groups() -> None:
+    """ Commits the files pending in every live `GroupSync` at exit."""
+    error = None
+    for group in list(_groups):
+        try:
+            group.flush()
+        except Exception as e:
+            error = error or e
+    if error is not None:
+        raise error
+
+_group: Optional[GroupSync] = None
+
+def get_group() -> GroupSync:
+    """ Returns the shared `GroupSync` used when durability is 'group'."""
+    global _group
+    if _group is None:
+        _group = GroupSync()
+    return _group
+
+def flush_group() -> None:
+    """ Commits the files pending in the shared `GroupSync`."""
+    if _group is not None:
+        _group.flush()
+
+@contextmanager
+def durable_open(
+    path: Union[str, Path],
+    mode: str = 'w',
+    atomic: bool = False,
+    durability: Union[str, GroupSync, None] = None,
+    **kwargs
+) -> Iterator[IO]:
+    """
+    Opens a file for writing with optional atomic replacement and durability.
+
+    Args:
+        path (Union[str, Path]): The file path to write to.
+        mode (str, optional): The mode passed to `open`. Defaults to 'w'.
+        atomic (bool, optional): If True, writes to a temporary file in the same directory
+            and replaces `path` with it only once the write succeeded. Defaults to False.
+        durability (Union[str, GroupSync, None], optional): `None` or 'none' never fsyncs,
+            'file' fsyncs every file, 'group' or a `GroupSync` batches the fsyncs, the file
+            is written and replaced at once but only durable after the commit. Defaults to None.
+        **kwargs: Additional arguments passed to the `open_file` function.
+
+    Raises:
+        ValueError: If `atomic` is used with an appending mode or `durability` is unknown.
+    """
+    group = _get_policy(durability)
+    path = Path(path)
+
+    if not atomic:
+        with open_file(path, mode, **kwargs) as f:
+            yield f
+
+        if durability == 'file':
+            _fsync_path(path)
+        elif group is not None:
+            group.add(path)
+        return
+
+    if 'a' in mode or '+' in mode:
+        raise ValueError(f'Atomic writes replace the whole file, mode {mode!r} is not supported.')
+
+    temp = _create_temp(path)
+    try:
+        with open_file(temp, mode.replace('x', 'w'), compression=get_compression(path), **kwargs) as f:
+            yield f
+
+        _copy_mode(path, temp)
+
+        if durability == 'file':
+            _fsync_path(Path(temp))
+
+        if 'x' in mode and path.exists():
+            raise FileExistsError(f'File exists: {path}')
+
+        os.replace(temp, path)
+        if durability == 'file':
+            fsync_dir(path.parent)
+        elif group is not None:
+            group.add(path)
+
+    except BaseException:
+        Path(temp).unlink(missing_ok=True)
+        raise
+
+def _get_policy(durability: Union[str, GroupSync, None]) -> Optional[GroupSync]:
+    if isinstance(durability, GroupSync):
+        return durability
+    if durability == 'group':
+        return get_group()
+    if durability in (None, 'none', 'file'):
+        return None
+    raise ValueError(f'Invalid durability: {durability!r}')
+
+def _create_temp(path: Path) -> str:
+    """
+    Creates an empty temporary file next to `path` with mode 0o666, so the kernel applies
+    the umask and a new target gets the permissions `open` would have given it.
+    """
+    flags = os.O_CREAT | os.O_EXCL | os.O_WRONLY | getattr(os, 'O_BINARY', 0)
+    while True:
+        temp = str(path.parent / f'.{path.name}.{os.urandom(6).hex()}.tmp')
+        try:
+            os.close(os.open(temp, flags, 0o666))
+            return temp
+        except FileExistsError:
+            continue
+
+def _copy_mode(path: Path, temp: str) -> None:
+    """ Gives the temporary file the permissions of the existing target."""
+    try:
+        os.chmod(temp, path.stat().st_mode & 0o7777)
+    except FileNotFoundError:
+        pass
+
+def _fsync_path(path: Path) -> None:
+    fd = os.open(path, os.O_RDWR | os.O_BINARY if os_is_windows() else os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
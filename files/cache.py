@@ -0,0 +1,103 @@
+import os
+import sys
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+__all__ = ['ReadCache', 'get_read_cache']
+
+READ_CACHE_SIZE = int(os.getenv('READ_CACHE_SIZE', 64 * 1024 * 1024))
+
+class ReadCache:
+    """
+    LRU cache of parsed file contents, bounded by an estimated size in bytes.
+
+    Entries are keyed by path and read arguments and validated against the file
+    `(st_mtime_ns, st_size)`, so a changed file is read again on the next call.
+    Cached lists are returned as copies, list rows included, so callers may mutate them freely.
+    """
+    def __init__(self, max_size: int = READ_CACHE_SIZE) -> None:
+        self.max_size = max_size
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._entries), 'size': self.size}
+
+    def load(self, func: Callable[..., Any], path: Union[str, Path], **kwargs: Any) -> Any:
+        """ Returns `func(path, **kwargs)`, from the cache while the file is unchanged."""
+        try:
+            key = (func.__name__, os.path.abspath(path), tuple(sorted(kwargs.items())))
+            hash(key)
+        except TypeError:
+            return func(path, **kwargs)
+
+        st = os.stat(path)
+        stamp = (st.st_mtime_ns, st.st_size)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] == stamp:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return _copy(entry[2])
+            self.misses += 1
+
+        value = func(path, **kwargs)
+        size = _sizeof(value)
+
+        with self._lock:
+            self._pop(key)
+            if size <= self.max_size:
+                self._entries[key] = (stamp, size, value)
+                self.size += size
+                while self.size > self.max_size:
+                    self._pop(next(iter(self._entries)))
+
+        return _copy(value)
+
+    def invalidate(self, path: Union[str, Path]) -> None:
+        """ Drops every entry of `path`."""
+        path = os.path.abspath(path)
+        with self._lock:
+            for key in [k for k in self._entries if k[1] == path]:
+                self._pop(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def _pop(self, key) -> None:
+        if entry := self._entries.pop(key, None):
+            self.size -= entry[1]
+
+_cache: Optional[ReadCache] = None
+
+def get_read_cache() -> ReadCache:
+    """ Returns the shared `ReadCache` used when `cache=True`."""
+    global _cache
+    if _cache is None:
+        _cache = ReadCache()
+    return _cache
+
+def cached(cache: Union[bool, ReadCache], func: Callable[..., Any], path: Union[str, Path], **kwargs: Any) -> Any:
+    cache = get_read_cache() if cache is True else cache
+    return cache.load(func, path, **kwargs)
+
+def _copy(value: Any) -> Any:
+    if isinstance(value, list):
+        return [list(item) if isinstance(item, list) else item for item in value]
+    return value
+
+def _sizeof(value: Any) -> int:
+    """ Rough size in bytes of strings, bytes and nested lists of them."""
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(_sizeof(item) for item in value)
+    return sys.getsizeof(value)
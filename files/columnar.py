@@ -0,0 +1,202 @@
+import sys
+from array import array
+from itertools import chain, islice
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from .io import iter_csv
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+__all__ = ['read_csv_columns', 'infer_dtype']
+
+DTYPES = ('int', 'float', 'str', 'category')
+INFER_ROWS = 1000
+CATEGORY_RATIO = 0.5
+_MAX_EXACT = 2**53
+
+def read_csv_columns(
+    path: Union[str, Path],
+    dtypes: Optional[Union[Dict[Union[str, int], str], List[str]]] = None,
+    header: bool = True,
+    delimiter: str = ',',
+    encoding: str = 'utf-8',
+    as_numpy: bool = False,
+    infer_rows: int = INFER_ROWS,
+    **kwargs
+) -> Dict[Union[str, int], Any]:
+    """
+    Reads a CSV file column by column into compact typed containers.
+
+    'int' columns are stored in `array('q')`, 'float' in `array('d')` (empty cells become nan),
+    'category' in a list of interned strings, so repeated values share a single object,
+    and 'str' in a plain list.
+
+    Args:
+        path (Union[str, Path]): The file path to the CSV file.
+        dtypes (Optional[Union[Dict[Union[str, int], str], List[str]]], optional): The dtype of each
+            column by name, index or position. Missing columns are inferred from the first
+            `infer_rows` rows. Defaults to None.
+        header (bool, optional): If True, the first row holds the column names,
+            otherwise columns are keyed by index. Defaults to True.
+        delimiter (str, optional): The character used to separate fields. Defaults to ','.
+        encoding (str, optional): Encoding to use for reading the CSV file. Defaults to 'utf-8'.
+        as_numpy (bool, optional): If True, returns NumPy arrays, sharing the memory of
+            the numeric columns. Defaults to False.
+        infer_rows (int, optional): The number of rows sampled to infer dtypes. Defaults to `INFER_ROWS`.
+        **kwargs: Additional arguments passed to `iter_csv`.
+
+    Returns:
+        Dict[Union[str, int], Any]: The columns keyed by name, or by index if `header` is False.
+
+    Raises:
+        ValueError: If a dtype is unknown or a value does not match an explicit dtype.
+        ImportError: If `as_numpy` is True and NumPy is not installed.
+    """
+    if as_numpy and np is None:
+        raise ImportError('Please install the numpy package to use as_numpy.')
+
+    rows = iter_csv(path, delimiter=delimiter, encoding=encoding, **kwargs)
+    names = next(rows, []) if header else None
+    sample = list(islice(rows, infer_rows))
+
+    width = len(names) if header else max(map(len, sample), default=0)
+    names = list(names) if header else list(range(width))
+    columns = [_Column(dtype) for dtype in _resolve_dtypes(names, dtypes, sample)]
+
+    for line, row in enumerate(chain(sample, rows), start=2 if header else 1):
+        for i, column in enumerate(columns):
+            column.append(row[i] if i < len(row) else '', line)
+
+    if reread := [(i, column.data) for i, column in enumerate(columns) if column.reread]:
+        for row in iter_csv(path, delimiter=delimiter, encoding=encoding, skip_header=header, **kwargs):
+            for i, data in reread:
+                data.append(row[i] if i < len(row) else '')
+
+    return {name: column.finish(as_numpy) for name, column in zip(names, columns)}
+
+def infer_dtype(values: List[str]) -> str:
+    """
+    Infers the dtype of a column from a sample of its values.
+
+    Integers must be written in canonical form, so values such as '+5511...' or '007'
+    are kept as strings. Columns with few distinct values are inferred as 'category'.
+    """
+    filled = [v for v in values if v]
+    if not filled:
+        return 'str'
+
+    if len(filled) == len(values) and all(_is_int(v) for v in filled):
+        return 'int'
+
+    if all(_is_float(v) for v in filled):
+        return 'float'
+
+    return 'category' if len(set(filled)) <= len(filled) * CATEGORY_RATIO else 'str'
+
+def _resolve_dtypes(names, dtypes, sample) -> List[tuple]:
+    """ Returns (dtype, inferred) for each column."""
+    if isinstance(dtypes, (list, tuple)):
+        dtypes = dict(enumerate(dtypes))
+    dtypes = dtypes or {}
+
+    resolved = []
+    for i, name in enumerate(names):
+        dtype = dtypes.get(name, dtypes.get(i))
+        if dtype is None:
+            resolved.append((infer_dtype([row[i] if i < len(row) else '' for row in sample]), True))
+        elif dtype in DTYPES:
+            resolved.append((dtype, False))
+        else:
+            raise ValueError(f'Invalid dtype {dtype!r} for column {name!r}, expected one of {DTYPES}.')
+
+    return resolved
+
+class _Column:
+    """
+    Inferred 'int' and 'float' columns are parsed as the rows arrive. An 'int' column that
+    meets a float is converted to 'float', unless it holds integers a double cannot represent
+    exactly. A column that falls back to 'str' drops its values and is read again by `reread`.
+    """
+    def __init__(self, dtype: tuple) -> None:
+        self.dtype, self.inferred = dtype
+        self.reread = False
+        self.data = self._new(self.dtype)
+
+    @staticmethod
+    def _new(dtype: str):
+        if dtype == 'int':
+            return array('q')
+        if dtype == 'float':
+            return array('d')
+        return []
+
+    def append(self, value: str, line: int) -> None:
+        if self.reread:
+            return
+
+        if self.inferred and self.dtype in ('int', 'float') and not self._fits(value):
+            self._promote(value)
+            if self.reread:
+                return
+
+        try:
+            self.data.append(_convert(self.dtype, value))
+        except (ValueError, OverflowError):
+            raise ValueError(f'Line {line}: {value!r} is not a valid {self.dtype}.')
+
+    def _fits(self, value: str) -> bool:
+        if self.dtype == 'int':
+            return _is_int(value)
+        return not value or (_is_float(value) and not _is_inexact(value))
+
+    def _promote(self, value: str) -> None:
+        """ Widens an inferred column that met a value outside its dtype."""
+        if self.dtype == 'int' and (not value or _is_float(value)) and not _is_inexact(value):
+            if all(-_MAX_EXACT <= v <= _MAX_EXACT for v in self.data):
+                self.dtype, self.data = 'float', array('d', self.data)
+                return
+
+        self.dtype, self.reread, self.data = 'str', True, []
+
+    def finish(self, as_numpy: bool) -> Any:
+        if not as_numpy:
+            return self.data
+        if isinstance(self.data, array):
+            return np.frombuffer(self.data, dtype=np.int64 if self.dtype == 'int' else np.float64)
+        return np.array(self.data, dtype=object)
+
+def _convert(dtype: str, value: str) -> Any:
+    if dtype == 'int':
+        return int(value)
+    if dtype == 'float':
+        return float(value) if value else float('nan')
+    if dtype == 'category':
+        return sys.intern(value)
+    return value
+
+def _is_int(value: str) -> bool:
+    try:
+        return str(int(value)) == value and -2**63 <= int(value) < 2**63
+    except ValueError:
+        return False
+
+def _is_float(value: str) -> bool:
+    """ Integer looking values must be canonical, so that phones such as '+5511...' stay strings."""
+    try:
+        return str(int(value)) == value
+    except ValueError:
+        pass
+    try:
+        float(value)
+        return True
+    except ValueError:
+        return False
+
+def _is_inexact(value: str) -> bool:
+    """ Integers above 2**53 lose digits as floats."""
+    digits = value[1:] if value.startswith('-') else value
+    return len(digits) > 15 and digits.isascii() and digits.isdigit() and abs(int(value)) > _MAX_EXACT
@@ -0,0 +1,65 @@
+import bz2
+import gzip
+import lzma
+from pathlib import Path
+from typing import IO, Optional, Union
+
+try:
+    from compression import zstd
+except ImportError:
+    try:
+        import zstandard as zstd
+    except ImportError:
+        zstd = None
+
+__all__ = ['open_file', 'get_compression', 'COMPRESSIONS']
+
+COMPRESSIONS = {
+    '.gz': gzip.open,
+    '.bz2': bz2.open,
+    '.xz': lzma.open,
+    '.lzma': lzma.open,
+    '.zst': zstd.open if zstd else None,
+}
+
+def get_compression(path: Union[str, Path]) -> Optional[str]:
+    """ Returns the compression suffix of `path`, or None if it is a plain file."""
+    suffix = Path(path).suffix.lower()
+    return suffix if suffix in COMPRESSIONS else None
+
+def open_file(
+    path: Union[str, Path, int],
+    mode: str = 'r',
+    compression: Optional[str] = 'infer',
+    **kwargs
+) -> IO:
+    """
+    Opens a file like `open`, compressing or decompressing it on the fly based on its suffix.
+
+    Args:
+        path (Union[str, Path, int]): The file path to open.
+        mode (str, optional): The mode passed to `open`. Defaults to 'r'.
+        compression (Optional[str], optional): A suffix from `COMPRESSIONS`, `'infer'` to use the
+            suffix of `path`, or None to open the file as is. Defaults to 'infer'.
+        **kwargs: Additional arguments passed to the `open` function of the codec.
+
+    Returns:
+        IO: The file object, a text stream unless `mode` contains 'b'.
+
+    Raises:
+        ImportError: If the file is zstd compressed and no zstd module is installed.
+    """
+    if compression == 'infer':
+        compression = get_compression(path) if not isinstance(path, int) else None
+
+    if not compression:
+        return open(path, mode, **kwargs)
+
+    opener = COMPRESSIONS[compression if compression.startswith('.') else f'.{compression}']
+    if opener is None:
+        raise ImportError('Please install the zstandard package to use .zst files.')
+
+    if 'b' not in mode and 't' not in mode:
+        mode += 't'
+
+    return opener(path, mode, **kwargs)
@@ -0,0 +1,165 @@
+import csv
+import io
+import os
+import struct
+from array import array
+from itertools import islice
+from collections.abc import Iterator
+from pathlib import Path
+from typing import List, Optional, Union
+
+from .io import read_bin, write_bin
+from .compression import get_compression
+
+__all__ = ['CsvIndex', 'read_csv_range', 'iter_csv_range']
+
+INDEX_STRIDE = int(os.getenv('INDEX_STRIDE', 1))
+INDEX_SUFFIX = '.idx'
+
+_MAGIC = b'CSVIDX1\0'
+_HEADER = struct.Struct('=8sQQQQ')
+
+class CsvIndex:
+    """
+    Sidecar index of the byte offset where every `stride`-th row of a CSV file starts.
+
+    The index is saved next to the file (`<path>.idx` by default), memory mapped on load and
+    rebuilt when the file `(st_mtime_ns, st_size)` changes, so reaching row N costs one seek
+    plus at most `stride - 1` skipped rows. Quoted fields spanning lines are handled.
+
+        with CsvIndex('users.csv') as index:
+            rows = list(index.iter_rows(1_000_000, 1_010_000))
+    """
+    def __init__(
+        self,
+        path: Union[str, Path],
+        index_path: Optional[Union[str, Path]] = None,
+        stride: int = INDEX_STRIDE,
+        delimiter: str = ',',
+        encoding: str = 'utf-8',
+        **kwargs
+    ) -> None:
+        if get_compression(path):
+            raise ValueError(f'Compressed files cannot be indexed: {path}')
+
+        self.path = Path(path)
+        self.index_path = Path(index_path) if index_path else self.path.with_name(self.path.name + INDEX_SUFFIX)
+        self.stride = stride
+        self.delimiter = delimiter
+        self.encoding = encoding
+        self.fmtparams = kwargs
+        self.rows = 0
+        self._mapped = None
+        self._offsets = None
+
+        if not self._load():
+            self.build()
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def __enter__(self) -> 'CsvIndex':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def build(self) -> None:
+        """ Scans the file and saves the offsets of its rows."""
+        self.close()
+        st = os.stat(self.path)
+        offsets = array('Q')
+        rows = 0
+        pos = 0
+        row_start = None
+
+        with open(self.path, 'rb') as f:
+            def lines():
+                nonlocal pos, row_start
+                for raw in f:
+                    if row_start is None:
+                        row_start = pos
+                    pos += len(raw)
+                    yield raw.decode(self.encoding)
+
+            for _ in csv.reader(lines(), delimiter=self.delimiter, **self.fmtparams):
+                if rows % self.stride == 0:
+                    offsets.append(row_start)
+                rows += 1
+                row_start = None
+
+        header = _HEADER.pack(_MAGIC, st.st_mtime_ns, st.st_size, self.stride, rows)
+        write_bin(self.index_path, header + offsets.tobytes(), atomic=True)
+        self.rows = rows
+        self._offsets = offsets
+
+    def offset(self, row: int) -> int:
+        """ Returns the byte offset of the indexed row at or before `row`."""
+        return self._offsets[row // self.stride]
+
+    def iter_rows(self, start: int = 0, stop: Optional[int] = None) -> Iterator[List[str]]:
+        """ Yields the rows from `start` to `stop` (exclusive), like slicing the result of `read_csv`."""
+        start, stop, _ = slice(start, stop).indices(self.rows)
+        if start >= stop:
+            return
+
+        with open(self.path, 'rb') as f:
+            f.seek(self.offset(start))
+            with io.TextIOWrapper(f, encoding=self.encoding, newline='') as text:
+                rows = csv.reader(text, delimiter=self.delimiter, **self.fmtparams)
+                yield from islice(rows, start % self.stride, start % self.stride + stop - start)
+
+    def close(self) -> None:
+        """ Releases the memory mapped index."""
+        if self._mapped is not None:
+            self._offsets.release()
+            self._mapped.close()
+            self._mapped = None
+        self._offsets = None
+
+    def _load(self) -> bool:
+        try:
+            mapped = read_bin(self.index_path, mapped=True)
+        except FileNotFoundError:
+            return False
+
+        st = os.stat(self.path)
+        if len(mapped) >= _HEADER.size:
+            magic, mtime_ns, size, stride, rows = _HEADER.unpack(mapped[:_HEADER.size])
+            if (magic, mtime_ns, size, stride) == (_MAGIC, st.st_mtime_ns, st.st_size, self.stride):
+                self._mapped = mapped
+                self._offsets = mapped.view[_HEADER.size:].cast('Q')
+                self.rows = rows
+                return True
+
+        mapped.close()
+        return False
+
+def iter_csv_range(
+    path: Union[str, Path],
+    start: int = 0,
+    stop: Optional[int] = None,
+    skip_header: bool = False,
+    **kwargs
+) -> Iterator[List[str]]:
+    """
+    Yields the rows from `start` to `stop` of a CSV file, building or reusing its `CsvIndex`.
+
+    Args:
+        path (Union[str, Path]): The file path to the CSV file.
+        start (int, optional): The first row to yield. Defaults to 0.
+        stop (Optional[int], optional): The row to stop before, None for the end of file. Defaults to None.
+        skip_header (bool, optional): If True, row 0 is the first row after the header. Defaults to False.
+        **kwargs: Additional arguments passed to `CsvIndex`.
+
+    Returns:
+        Iterator[List[str]]: The rows of the range.
+    """
+    with CsvIndex(path, **kwargs) as index:
+        header = 1 if skip_header else 0
+        start, stop, _ = slice(start, stop).indices(max(len(index) - header, 0))
+        yield from index.iter_rows(start + header, stop + header)
+
+def read_csv_range(path: Union[str, Path], start: int = 0, stop: Optional[int] = None, **kwargs) -> List[List[str]]:
+    """ Eager counterpart of `iter_csv_range`, accepts the same arguments."""
+    return list(iter_csv_range(path, start, stop, **kwargs))
@@ -1,10 +1,25 @@
 from typing import Union, List, Optional, Tuple
-from collections.abc import Iterable
+from collections.abc import Iterable, Iterator
 from pathlib import Path
+import codecs
 import csv
-
+import hashlib
+from itertools import islice
+import mmap
+import os
+import sqlite3
+import tempfile
+
+from.atomic import durable_open, GroupSync
+from.compression import open_file, get_compression
+from.cache import ReadCache, cached
 from..miscellaneous import is_list_like, convert_iter
 
+CHUNK_SIZE = 1024 * 1024
+REVERSE_BLOCK_SIZE = 64 * 1024
+DEDUP_CAPACITY = int(os.getenv('DEDUP_CAPACITY', 50_000_000))
+DEDUP_SPILL_BATCH = 100_000
+
 def read(
     path: Union[str, Path],
     split: bool = False,
@@ -12,6 +27,7 @@ def read(
     binary: bool = False,
     encoding: str = 'utf-8',
     ignore_errors: bool = False,
+    cache: Union[bool, ReadCache] = False,
     **kwargs
 ) -> Union[str, bytes, List[str]]:
     """
@@ -23,6 +39,8 @@ def read(
         split (bool, optional): If True, splits the file content into a list of lines. Defaults to False.
         ignore_errors (bool, optional): If True, returns an empty string or list when an error occurs. Defaults to True.
         binary (bool, optional): If True, reads the file in binary mode. Defaults to False.
+        cache (Union[bool, ReadCache], optional): If True or a `ReadCache`, returns the cached content
+            while the file is unchanged. Defaults to False.
         **kwargs: Additional arguments passed to the `open` function.
 
     Returns:
@@ -34,23 +52,192 @@ def read(
     try:
 
         if binary:
-            return read_bin(path, **kwargs)
+            return read_bin(path, cache=cache, **kwargs)
 
-        text = _read_text(path, encoding, **kwargs)
+        if cache:
+            return cached(cache, read, path, split=split, drop_empty=drop_empty, encoding=encoding, **kwargs)
 
-        if not split:
-            return text
-        text = text.splitlines()
+        if split:
+            return list(_iter_lines(path, drop_empty, encoding, **kwargs))
 
-        if drop_empty:
-            return [line.strip() for line in text if line.strip()]
-        return text.splitlines()
+        return _read_text(path, encoding, **kwargs)
 
     except Exception as e:
         if ignore_errors and not binary:
-            return '' if split else []
+            return [] if split else ''
         raise e
 
+def iter_read(
+    path: Union[str, Path],
+    split: bool = False,
+    drop_empty: bool = True,
+    binary: bool = False,
+    encoding: str = 'utf-8',
+    ignore_errors: bool = False,
+    chunk_size: int = CHUNK_SIZE,
+    **kwargs
+) -> Iterator[Union[str, bytes]]:
+    """
+    Lazy counterpart of `read`, yields lines if `split` is True, chunks otherwise.
+
+    Args:
+        path (Union[str, Path]): The file path to read from.
+        split (bool, optional): If True, yields lines instead of chunks. Defaults to False.
+        drop_empty (bool, optional): If True, strips lines and skips the empty ones. Defaults to True.
+        binary (bool, optional): If True, yields `bytes` chunks. Ignored when `split` is True. Defaults to False.
+        encoding (str, optional): Encoding to use for reading text files. Defaults to 'utf-8'.
+        ignore_errors (bool, optional): If True, stops silently when an error occurs. Defaults to False.
+        chunk_size (int, optional): Size of each chunk in characters (or bytes). Defaults to `CHUNK_SIZE`.
+        **kwargs: Additional arguments passed to the `open` function.
+
+    Returns:
+        Iterator[Union[str, bytes]]: The lines or chunks of the file.
+    """
+    if split:
+        return iter_lines(path, drop_empty, encoding, ignore_errors, **kwargs)
+    return iter_chunks(path, chunk_size, binary, encoding, ignore_errors, **kwargs)
+
+def iter_lines(
+    path: Union[str, Path],
+    drop_empty: bool = True,
+    encoding: str = 'utf-8',
+    ignore_errors: bool = False,
+    **kwargs
+) -> Iterator[str]:
+    """
+    Yields the lines of a text file one by one, keeping memory constant.
+
+    Args:
+        path (Union[str, Path]): The file path to read from.
+        drop_empty (bool, optional): If True, strips each line and skips the empty ones. Defaults to True.
+        encoding (str, optional): Encoding to use for reading the file. Defaults to 'utf-8'.
+        ignore_errors (bool, optional): If True, stops silently when an error occurs. Defaults to False.
+        **kwargs: Additional arguments passed to the `open` function.
+
+    Returns:
+        Iterator[str]: The lines of the file without the line terminator.
+
+    Raises:
+        Exception: Raises an exception if `ignore_errors` is set to False and an error occurs.
+    """
+    try:
+        yield from _iter_lines(path, drop_empty, encoding, **kwargs)
+    except Exception as e:
+        if not ignore_errors:
+            raise e
+
+def iter_lines_reverse(
+    path: Union[str, Path],
+    drop_empty: bool = True,
+    encoding: str = 'utf-8',
+    ignore_errors: bool = False,
+    errors: str = 'strict',
+    block_size: int = REVERSE_BLOCK_SIZE,
+) -> Iterator[str]:
+    """
+    Yields the lines of a text file from the last to the first, reading it backwards in blocks.
+
+    Lines are split on raw b'\n' bytes before decoding, which never splits a UTF-8 character,
+    so only the blocks holding the requested lines are read.
+
+    Args:
+        path (Union[str, Path]): The file path to read from.
+        drop_empty (bool, optional): If True, strips each line and skips the empty ones. Defaults to True.
+        encoding (str, optional): Encoding of the file, must be ASCII compatible. Defaults to 'utf-8'.
+        ignore_errors (bool, optional): If True, stops silently when an error occurs. Defaults to False.
+        errors (str, optional): How decoding errors are handled, as in `bytes.decode`. Defaults to 'strict'.
+        block_size (int, optional): The number of bytes read per seek. Defaults to `REVERSE_BLOCK_SIZE`.
+
+    Returns:
+        Iterator[str]: The lines of the file in reverse order, without the line terminator.
+
+    Raises:
+        Exception: Raises an exception if `ignore_errors` is set to False and an error occurs.
+    """
+    try:
+        if get_compression(path):
+            raise ValueError(f'Compressed files cannot be read backwards: {path}')
+
+        if codecs.lookup(encoding).name.startswith(('utf-16', 'utf-32')):
+            raise ValueError(f'Encoding {encoding!r} cannot be split on newlines.')
+
+        for line in _iter_raw_lines_reverse(path, block_size):
+            line = line.decode(encoding, errors)
+            if drop_empty:
+                if line := line.strip():
+                    yield line
+            else:
+                yield line
+
+    except Exception as e:
+        if not ignore_errors:
+            raise e
+
+def tail(
+    path: Union[str, Path],
+    n: int = 10,
+    drop_empty: bool = True,
+    encoding: str = 'utf-8',
+    ignore_errors: bool = False,
+    **kwargs
+) -> List[str]:
+    """
+    Returns the last `n` lines of a text file in file order, without reading the whole file.
+
+    Args:
+        path (Union[str, Path]): The file path to read from.
+        n (int, optional): The number of lines to return. Defaults to 10.
+        drop_empty (bool, optional): If True, strips each line and skips the empty ones. Defaults to True.
+        encoding (str, optional): Encoding of the file, must be ASCII compatible. Defaults to 'utf-8'.
+        ignore_errors (bool, optional): If True, returns the lines read before an error occurred. Defaults to False.
+        **kwargs: Additional arguments passed to `iter_lines_reverse`.
+
+    Returns:
+        List[str]: The last lines of the file.
+    """
+    lines = list(islice(iter_lines_reverse(path, drop_empty, encoding, ignore_errors, **kwargs), n))
+    lines.reverse()
+    return lines
+
+def iter_chunks(
+    path: Union[str, Path],
+    chunk_size: int = CHUNK_SIZE,
+    binary: bool = False,
+    encoding: str = 'utf-8',
+    ignore_errors: bool = False,
+    **kwargs
+) -> Iterator[Union[str, bytes]]:
+    """
+    Yields the content of a file in chunks of at most `chunk_size` characters (or bytes).
+
+    Args:
+        path (Union[str, Path]): The file path to read from.
+        chunk_size (int, optional): Size of each chunk. Defaults to `CHUNK_SIZE`.
+        binary (bool, optional): If True, reads the file in binary mode and yields `bytes`. Defaults to False.
+        encoding (str, optional): Encoding to use for reading text files. Defaults to 'utf-8'.
+        ignore_errors (bool, optional): If True, stops silently when an error occurs. Defaults to False.
+        **kwargs: Additional arguments passed to the `open` function.
+
+    Returns:
+        Iterator[Union[str, bytes]]: The chunks of the file.
+
+    Raises:
+        Exception: Raises an exception if `ignore_errors` is set to False and an error occurs.
+    """
+    try:
+        if binary:
+            f = open_file(path, mode='rb', **kwargs)
+        else:
+            f = open_file(path, encoding=encoding, **kwargs)
+
+        with f:
+            while chunk := f.read(chunk_size):
+                yield chunk
+
+    except Exception as e:
+        if not ignore_errors:
+            raise e
+
 def readlines(
     path: Union[str, Path],
     drop_empty: bool = True,
@@ -58,7 +245,7 @@ def readlines(
     ignore_errors: bool = False,
     **kwargs
 ) -> List[str]:
-    return readlines(path, split=True, drop_empty=drop_empty, encoding=encoding, ignore_errors=ignore_errors, **kwargs)
+    return read(path, split=True, drop_empty=drop_empty, encoding=encoding, ignore_errors=ignore_errors, **kwargs)
 
 def write(
     path: Union[str, Path],
@@ -67,6 +254,8 @@ def write(
     mode: str = 'w',
     ignore_errors: bool = False,
     binary: bool = False,
+    atomic: bool = False,
+    durability: Union[str, GroupSync, None] = None,
     **kwargs
 ) -> Union[Path, None]:
     """
@@ -78,6 +267,9 @@ def write(
         encoding (str, optional): Encoding to use for writing text files. Defaults to 'utf-8'.
         ignore_errors (bool, optional): If True, ignores errors during writing. Defaults to False.
         binary (bool, optional): If True, writes the file in binary mode. Defaults to False.
+        atomic (bool, optional): If True, writes to a temporary file then replaces `path` with it,
+            so readers never see a partially written file. Defaults to False.
+        durability (Union[str, GroupSync, None], optional): The fsync policy, see `durable_open`. Defaults to None.
         **kwargs: Additional arguments passed to the `open` function.
 
     Returns:
@@ -88,9 +280,9 @@ def write(
     """
     try:
         if binary:
-            write_bin(path, content, **kwargs)
+            write_bin(path, content, atomic=atomic, durability=durability, **kwargs)
         else:
-           _write_text(path, encoding, mode, content, **kwargs)
+           _write_text(path, encoding, mode, content, atomic=atomic, durability=durability, **kwargs)
 
         return Path(path)
 
@@ -107,6 +299,8 @@ def read_csv(
     newline: str ='',
     drop: bool = False,
     skip_header: bool = False,
+    dedup: Union[bool, str] = False,
+    cache: Union[bool, ReadCache] = False,
     **kwargs
 ) -> List[Optional[Union[List[str], Tuple[str]]]]:
     """
@@ -118,9 +312,12 @@ def read_csv(
         encoding (str, optional): Encoding to use for reading the CSV file. Defaults to 'utf-8'.
         ignore_errors (bool, optional): If True, ignores errors during reading. Defaults to False.
         newline (str, optional): Specifies how newline characters should be handled. Defaults to ''.
-        drop (bool, optional): If True, strips whitespace from each field. Defaults to False.
+        drop (bool, optional): If True, strips whitespace from each field and drops duplicated rows. Defaults to False.
         skip_header (bool, optional): If True, skips the header row of the CSV file. Defaults to False.
-        **kwargs: Additional arguments passed to the `csv.reader` function.
+        dedup (Union[bool, str], optional): Drops duplicated rows keeping the first occurrence, see `unique_rows`. Defaults to False.
+        cache (Union[bool, ReadCache], optional): If True or a `ReadCache`, returns the cached rows
+            while the file is unchanged. Defaults to False.
+        **kwargs: Additional arguments passed to the `open` function.
 
     Returns:
         List[Optional[Union[List[str], Tuple[str]]]]: A list of rows, where each row is a list or tuple of strings.
@@ -129,20 +326,103 @@ def read_csv(
         Exception: Raises an exception if `ignore_errors` is set to False and an error occurs.
     """
     try:
-        rows = _read_csv(path, newline, encoding, delimiter, **kwargs)
+        if cache:
+            return cached(
+                cache, read_csv, path, delimiter=delimiter, encoding=encoding, newline=newline,
+                drop=drop, skip_header=skip_header, dedup=dedup, **kwargs
+            )
 
-        if skip_header:
-            rows.pop(0)
+        return list(_iter_csv(path, newline, encoding, delimiter, drop, skip_header, dedup, **kwargs))
 
-        if drop:
-            rows = set(tuple(map(lambda c: c.strip(), row)) for row in rows)
+    except Exception as e:
+        if not ignore_errors:
+            raise e
+        return []
+
+def iter_csv(
+    path: Union[str, Path],
+    delimiter: str = ',',
+    encoding: str = 'utf-8',
+    ignore_errors: bool = False,
+    newline: str ='',
+    drop: bool = False,
+    skip_header: bool = False,
+    dedup: Union[bool, str] = False,
+    **kwargs
+) -> Iterator[Union[List[str], Tuple[str]]]:
+    """
+    Lazy counterpart of `read_csv`, yields the rows one by one in file order.
+
+    Args:
+        path (Union[str, Path]): The file path to the CSV file.
+        delimiter (str, optional): The character used to separate fields. Defaults to ','.
+        encoding (str, optional): Encoding to use for reading the CSV file. Defaults to 'utf-8'.
+        ignore_errors (bool, optional): If True, stops silently when an error occurs. Defaults to False.
+        newline (str, optional): Specifies how newline characters should be handled. Defaults to ''.
+        drop (bool, optional): If True, strips whitespace from each field and drops duplicated rows. Defaults to False.
+        skip_header (bool, optional): If True, skips the header row of the CSV file. Defaults to False.
+        dedup (Union[bool, str], optional): Drops duplicated rows keeping the first occurrence, see `unique_rows`. Defaults to False.
+        **kwargs: Additional arguments passed to the `open` function.
 
-        return list(rows)
+    Returns:
+        Iterator[Union[List[str], Tuple[str]]]: The rows of the file, tuples if `drop` is True.
 
+    Raises:
+        Exception: Raises an exception if `ignore_errors` is set to False and an error occurs.
+    """
+    try:
+        yield from _iter_csv(path, newline, encoding, delimiter, drop, skip_header, dedup, **kwargs)
     except Exception as e:
         if not ignore_errors:
             raise e
-        return []
+
+def unique_rows(
+    rows: Iterable[Iterable[str]],
+    dedup: Union[bool, str] = True,
+    capacity: int = DEDUP_CAPACITY,
+    tmp_dir: Optional[Union[str, Path]] = None
+) -> Iterator[Iterable[str]]:
+    """
+    Yields the rows not seen before, keeping their original order.
+
+    Args:
+        rows (Iterable[Iterable[str]]): The rows to filter.
+        dedup (Union[bool, str], optional): `True` or `'exact'` remembers every distinct row.
+            `'hash'` remembers a 64 bits fingerprint of each distinct row instead, which is much
+            smaller but still grows with the number of distinct rows. `'bloom'` keeps memory bounded:
+            fingerprints are spilled to an SQLite file on disk and only looked up when an in-memory
+            Bloom filter sized for `capacity` rows reports a possible duplicate. Both fingerprint modes
+            have a negligible chance of dropping a colliding row. Defaults to True.
+        capacity (int, optional): The expected number of distinct rows in 'bloom' mode, more rows only
+            cause more disk lookups. Defaults to `DEDUP_CAPACITY`.
+        tmp_dir (Optional[Union[str, Path]], optional): Where 'bloom' mode spills. Defaults to the system temp dir.
+
+    Returns:
+        Iterator[Iterable[str]]: The distinct rows.
+
+    Raises:
+        ValueError: If `dedup` is not a known mode.
+    """
+    if dedup == 'bloom':
+        with _SpilledSet(capacity, tmp_dir) as seen:
+            for row in rows:
+                if seen.add(_fingerprint(row)):
+                    yield row
+        return
+
+    if dedup is True or dedup == 'exact':
+        key = tuple
+    elif dedup == 'hash':
+        key = _fingerprint
+    else:
+        raise ValueError(f'Invalid dedup mode: {dedup!r}')
+
+    seen = set()
+    for row in rows:
+        k = key(row)
+        if k not in seen:
+            seen.add(k)
+            yield row
 
 def write_csv(
     path: Union[str, Path],
@@ -152,6 +432,8 @@ def write_csv(
     encoding: str = 'utf-8',
     newline: str ='',
     header: Optional[Iterable[str]] = None,
+    atomic: bool = False,
+    durability: Union[str, GroupSync, None] = None,
     **kwargs
 ) -> Union[Path, None]:
     """
@@ -164,40 +446,243 @@ def write_csv(
         encoding (str, optional): Encoding to use for writing the CSV file. Defaults to 'utf-8'.
         newline (str, optional): Specifies how newline characters should be handled. Defaults to ''.
         header (Optional[Iterable[str]], optional): A list of column headers to write before the data. Defaults to None.
-        **kwargs: Additional arguments passed to the `csv.writer` function.
+        atomic (bool, optional): If True, writes to a temporary file then replaces `path` with it. Defaults to False.
+        durability (Union[str, GroupSync, None], optional): The fsync policy, see `durable_open`. Defaults to None.
+        **kwargs: Additional arguments passed to the `open` function.
 
     Returns:
         None
     """
-    with open(path, mode=mode, encoding=encoding, newline=newline, **kwargs) as f:
+    with durable_open(path, mode, atomic, durability, encoding=encoding, newline=newline, **kwargs) as f:
         writer = csv.writer(f, delimiter=delimiter)
         if header:
             writer.writerow(header)
         writer.writerows(convert_iter(rows))
         return Path(path)
 
-def read_bin(path,  **kwargs) -> bytes:
-    with open(path, mode='rb', **kwargs) as f:
+def read_bin(
+    path,
+    mapped: bool = False,
+    cache: Union[bool, ReadCache] = False,
+    **kwargs
+) -> Union[bytes, 'MappedFile']:
+    """
+    Reads a binary file.
+
+    Args:
+        path (Union[str, Path]): The file path to read from.
+        mapped (bool, optional): If True, memory maps the file and returns a `MappedFile`
+            instead of copying the content into a new `bytes`. Defaults to False.
+        cache (Union[bool, ReadCache], optional): If True or a `ReadCache`, returns the cached content
+            while the file is unchanged. Ignored if `mapped` is True. Defaults to False.
+        **kwargs: Additional arguments passed to the `open` function.
+
+    Returns:
+        Union[bytes, MappedFile]: The content of the file.
+    """
+    if mapped:
+        return MappedFile(path, **kwargs)
+
+    if cache:
+        return cached(cache, read_bin, path, **kwargs)
+
+    with open_file(path, mode='rb', **kwargs) as f:
         return f.read()
     
-def write_bin(path, content: bytes, **kwargs) -> None:
-    with open(path, mode='wb', **kwargs) as f:
+class MappedFile:
+    """
+    Read-only memory map of a file, exposes its content as a zero-copy `memoryview`.
+
+    Use it as a context manager, slices and `view` are only valid until the file is closed.
+    Slices taken with `data[a:b]` must not outlive the mapping, copy them with `bytes()`
+    to keep them, otherwise closing raises `BufferError`.
+
+        with read_bin('session.dump', mapped=True) as data:
+            digest = hashlib.sha256(data.view).hexdigest()
+            header = bytes(data[:16])
+    """
+    def __init__(self, path: Union[str, Path], **kwargs) -> None:
+        if get_compression(path):
+            raise ValueError(f'Compressed files cannot be memory mapped: {path}')
+
+        self.path = Path(path)
+        self._file = open(path, mode='rb', **kwargs)
+        try:
+            size = os.fstat(self._file.fileno()).st_size
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+        except Exception:
+            self._file.close()
+            raise
+        self.view = memoryview(self._mmap) if self._mmap else memoryview(b'')
+
+    @property
+    def closed(self) -> bool:
+        return self._file.closed
+
+    def __len__(self) -> int:
+        return len(self.view)
+
+    def __getitem__(self, key: Union[int, slice]) -> Union[int, memoryview]:
+        return self.view[key]
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.view)
+
+    def __bytes__(self) -> bytes:
+        return self.view.tobytes()
+
+    def __enter__(self) -> 'MappedFile':
+        return self
+
+    def __exit__(self, exc_type, *args) -> None:
+        try:
+            self.close()
+        except BufferError:
+            if exc_type is None:
+                raise
+
+    def iter_chunks(self, chunk_size: int = CHUNK_SIZE) -> Iterator[memoryview]:
+        """ Yields zero-copy slices of at most `chunk_size` bytes, each released once the next one is requested."""
+        for start in range(0, len(self.view), chunk_size):
+            with self.view[start:start + chunk_size] as chunk:
+                yield chunk
+
+    def close(self) -> None:
+        """
+        Closes the mapping and the file. While a slice is alive the mapping cannot be closed,
+        `BufferError` is raised and the file stays open, so `close` can be called again later.
+        An error from the body of a `with` block is never replaced by that `BufferError`.
+        """
+        if self.closed:
+            return
+
+        self.view.release()
+        if self._mmap:
+            try:
+                self._mmap.close()
+            except BufferError:
+                self.view = memoryview(self._mmap)
+                raise
+        self._file.close()
+
+def write_bin(
+    path,
+    content: bytes,
+    atomic: bool = False,
+    durability: Union[str, GroupSync, None] = None,
+    **kwargs
+) -> None:
+    with durable_open(path, 'wb', atomic, durability, **kwargs) as f:
         return f.write(content)
  
-def _write_text(path, encoding, mode, content: str|Iterable[str], **kwargs) -> None:
-    with open(path, mode, encoding=encoding, **kwargs) as f:
+def _write_text(path, encoding, mode, content: str|Iterable[str], atomic=False, durability=None, **kwargs) -> None:
+    with durable_open(path, mode, atomic, durability, encoding=encoding, **kwargs) as f:
         if is_list_like(content):
             f.writelines(content)
         else:
             f.write(content)
 
+def _iter_raw_lines_reverse(path, block_size) -> Iterator[bytes]:
+    with open(path, 'rb') as f:
+        pos = f.seek(0, os.SEEK_END)
+        rest = None
+
+        while pos > 0:
+            size = min(block_size, pos)
+            pos -= size
+            f.seek(pos)
+            block = f.read(size)
+
+            if rest is None:
+                if block.endswith(b'\n'):
+                    block = block[:-1]
+                rest = b''
+
+            lines = (block + rest).split(b'\n')
+            rest = lines[0]
+            for line in reversed(lines[1:]):
+                yield line.removesuffix(b'\r')
+
+        if rest is not None:
+            yield rest.removesuffix(b'\r')
+
 def _read_text(path, encoding, **kwargs) -> Union[str, List[str]]:
-    with open(path, encoding=encoding, **kwargs) as f:
+    with open_file(path, encoding=encoding, **kwargs) as f:
         return f.read()
 
-def _read_csv(path, newline, encoding, delimiter, **kwargs) -> List[List[str]]:
-    with open(path, newline=newline, encoding=encoding, **kwargs) as f:
-        return list(csv.reader(f, delimiter=delimiter))
-
+def _iter_lines(path, drop_empty, encoding, **kwargs) -> Iterator[str]:
+    """ Splits each physical line with `str.splitlines`, so the lines match `read(split=True)` on the whole text."""
+    with open_file(path, encoding=encoding, **kwargs) as f:
+        for physical in f:
+            for line in physical.splitlines():
+                if drop_empty:
+                    if line := line.strip():
+                        yield line
+                else:
+                    yield line
+
+def _iter_csv(path, newline, encoding, delimiter, drop, skip_header, dedup, **kwargs) -> Iterator[List[str]]:
+    with open_file(path, newline=newline, encoding=encoding, **kwargs) as f:
+        rows = csv.reader(f, delimiter=delimiter)
 
+        if skip_header:
+            next(rows, None)
 
+        if drop:
+            rows = (tuple(c.strip() for c in row) for row in rows)
+            dedup = dedup or True
+
+        if dedup:
+            rows = unique_rows(rows, dedup)
+
+        yield from rows
+
+def _fingerprint(row: Iterable[str]) -> int:
+    """ Signed 64 bits hash of a row, every field is length prefixed so ('a,b',) and ('a', 'b') differ."""
+    h = hashlib.blake2b(digest_size=8)
+    for field in row:
+        data = field.encode('utf-8', 'surrogatepass')
+        h.update(len(data).to_bytes(8, 'little'))
+        h.update(data)
+    return int.from_bytes(h.digest(), 'little', signed=True)
+
+class _SpilledSet:
+    """ Set of fingerprints with bounded memory, a Bloom filter in memory confirmed by an SQLite table on disk."""
+    HASHES = 7
+
+    def __init__(self, capacity: int, tmp_dir: Optional[Union[str, Path]] = None) -> None:
+        # 10 bits per row with 7 hashes gives about 1% of disk lookups for new rows
+        self.bits = max(capacity * 10, 1 << 16)
+        self.filter = bytearray((self.bits + 7) // 8)
+        self.pending = set()
+        self._dir = tempfile.TemporaryDirectory(prefix='dedup-', dir=tmp_dir)
+        self.db = sqlite3.connect(os.path.join(self._dir.name, 'seen.db'))
+        self.db.execute('PRAGMA journal_mode=OFF')
+        self.db.execute('PRAGMA synchronous=OFF')
+        self.db.execute('CREATE TABLE seen (fp INTEGER PRIMARY KEY)')
+
+    def __enter__(self) -> '_SpilledSet':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.db.close()
+        self._dir.cleanup()
+
+    def add(self, fp: int) -> bool:
+        """ Adds `fp`, returns False if it was already present."""
+        h1, h2 = fp & 0xFFFFFFFF, (fp >> 32) | 1
+        positions = [(h1 + i * h2) % self.bits for i in range(self.HASHES)]
+        f = self.filter
+
+        if all(f[p >> 3] & (1 << (p & 7)) for p in positions):
+            if fp in self.pending or self.db.execute('SELECT 1 FROM seen WHERE fp = ?', (fp,)).fetchone():
+                return False
+
+        for p in positions:
+            f[p >> 3] |= 1 << (p & 7)
+
+        self.pending.add(fp)
+        if len(self.pending) >= DEDUP_SPILL_BATCH:
+            self.db.executemany('INSERT OR IGNORE INTO seen VALUES (?)', ((fp,) for fp in self.pending))
+            self.pending.clear()
+        return True
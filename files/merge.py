@@ -0,0 +1,141 @@
+import heapq
+import os
+import tempfile
+from itertools import chain, islice
+from collections.abc import Callable, Iterable, Iterator
+from pathlib import Path
+from typing import Any, List, Optional, Union
+
+from .io import iter_csv, write_csv
+
+__all__ = ['merge_csv', 'iter_merge_csv', 'iter_sorted_rows']
+
+SORT_MAX_ROWS = int(os.getenv('SORT_MAX_ROWS', 1_000_000))
+MERGE_FAN_IN = int(os.getenv('MERGE_FAN_IN', 256))
+
+def merge_csv(
+    paths: Iterable[Union[str, Path]],
+    output: Union[str, Path],
+    header: Optional[Iterable[str]] = None,
+    atomic: bool = True,
+    delimiter: str = ',',
+    encoding: str = 'utf-8',
+    **kwargs
+) -> Path:
+    """
+    Merges CSV files into `output` in a single streaming pass, see `iter_merge_csv`.
+    The output is written with the same `delimiter` and `encoding` as the inputs.
+
+    Args:
+        paths (Iterable[Union[str, Path]]): The CSV files to merge.
+        output (Union[str, Path]): The file to write the merged rows to.
+        header (Optional[Iterable[str]], optional): A header written before the rows. Defaults to None.
+        atomic (bool, optional): If True, `output` is only replaced once the merge succeeded. Defaults to True.
+        delimiter (str, optional): The character used to separate fields. Defaults to ','.
+        encoding (str, optional): Encoding of the CSV files. Defaults to 'utf-8'.
+        **kwargs: Additional arguments passed to `iter_merge_csv`.
+
+    Returns:
+        Path: The path of the merged file.
+    """
+    rows = iter_merge_csv(paths, delimiter=delimiter, encoding=encoding, **kwargs)
+    return write_csv(output, rows, delimiter=delimiter, encoding=encoding, header=header, atomic=atomic)
+
+def iter_merge_csv(
+    paths: Iterable[Union[str, Path]],
+    key: Optional[Callable[[List[str]], Any]] = None,
+    reverse: bool = False,
+    dedup: bool = False,
+    sort: bool = False,
+    skip_header: bool = False,
+    delimiter: str = ',',
+    encoding: str = 'utf-8',
+    max_rows: int = SORT_MAX_ROWS,
+    tmp_dir: Optional[Union[str, Path]] = None,
+) -> Iterator[List[str]]:
+    """
+    Yields the rows of sorted CSV files in sorted order with a k-way merge.
+
+    Only one row per file is held in memory. With `sort` the inputs may be unsorted,
+    they are sorted externally first, spilling sorted runs of `max_rows` rows to temporary files.
+
+    Args:
+        paths (Iterable[Union[str, Path]]): The CSV files to merge, each sorted by `key` unless `sort` is True.
+        key (Optional[Callable[[List[str]], Any]], optional): The sort key of a row, rows are
+            compared as lists of strings if None. Defaults to None.
+        reverse (bool, optional): If True, the inputs are sorted in descending order. Defaults to False.
+        dedup (bool, optional): If True, drops rows whose key equals the key of the previous row. Defaults to False.
+        sort (bool, optional): If True, sorts the inputs instead of expecting them sorted. Defaults to False.
+        skip_header (bool, optional): If True, skips the header row of every file. Defaults to False.
+        delimiter (str, optional): The character used to separate fields. Defaults to ','.
+        encoding (str, optional): Encoding of the CSV files. Defaults to 'utf-8'.
+        max_rows (int, optional): The number of rows sorted in memory per run. Defaults to `SORT_MAX_ROWS`.
+        tmp_dir (Optional[Union[str, Path]], optional): Where runs are spilled. Defaults to the system temp dir.
+
+    Returns:
+        Iterator[List[str]]: The merged rows.
+    """
+    sources = [iter_csv(path, delimiter=delimiter, encoding=encoding, skip_header=skip_header) for path in paths]
+
+    if sort:
+        rows = iter_sorted_rows(chain.from_iterable(sources), key, reverse, max_rows, tmp_dir)
+    else:
+        rows = _merge(sources, key, reverse)
+
+    if dedup:
+        rows = _drop_consecutive(rows, key)
+
+    yield from rows
+
+def iter_sorted_rows(
+    rows: Iterable[List[str]],
+    key: Optional[Callable[[List[str]], Any]] = None,
+    reverse: bool = False,
+    max_rows: int = SORT_MAX_ROWS,
+    tmp_dir: Optional[Union[str, Path]] = None,
+) -> Iterator[List[str]]:
+    """
+    Sorts rows of strings in bounded memory with an external merge sort.
+
+    Rows are sorted `max_rows` at a time, every sorted run is spilled to a temporary CSV file and the
+    runs are merged back at most `MERGE_FAN_IN` at a time. Input that fits in one run never touches disk.
+    """
+    rows = iter(rows)
+    first = sorted(islice(rows, max_rows), key=key, reverse=reverse)
+    if len(first) < max_rows:
+        yield from first
+        return
+
+    with tempfile.TemporaryDirectory(dir=tmp_dir, prefix='merge-') as tmp:
+        runs = [_spill(tmp, 0, first)]
+        del first
+
+        while chunk := sorted(islice(rows, max_rows), key=key, reverse=reverse):
+            runs.append(_spill(tmp, len(runs), chunk))
+
+        while len(runs) > MERGE_FAN_IN:
+            merged = []
+            for i in range(0, len(runs), MERGE_FAN_IN):
+                group = runs[i:i + MERGE_FAN_IN]
+                merged.append(_spill(tmp, f'm{len(runs)}-{i}', _merge([iter_csv(run) for run in group], key, reverse)))
+                for run in group:
+                    run.unlink()
+            runs = merged
+
+        yield from _merge([iter_csv(run) for run in runs], key, reverse)
+
+def _merge(sources: List[Iterator[List[str]]], key, reverse) -> Iterator[List[str]]:
+    if len(sources) == 1:
+        return sources[0]
+    return heapq.merge(*sources, key=key, reverse=reverse)
+
+def _spill(tmp: str, name: Any, rows: Iterable[List[str]]) -> Path:
+    return write_csv(Path(tmp, f'run-{name}.csv'), rows)
+
+def _drop_consecutive(rows: Iterable[List[str]], key) -> Iterator[List[str]]:
+    previous = object()
+    for row in rows:
+        k = key(row) if key else row
+        if k != previous:
+            previous = k
+            yield row
@@ -0,0 +1,139 @@
+import codecs
+import csv
+import io
+import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from collections.abc import Iterator
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
+
+from .io import unique_rows
+from .compression import get_compression
+
+__all__ = ['read_csv_parallel', 'iter_csv_parallel', 'split_ranges']
+
+PARALLEL_CHUNK_SIZE = int(os.getenv('PARALLEL_CHUNK_SIZE', 32 * 1024 * 1024))
+
+def read_csv_parallel(path: Union[str, Path], **kwargs) -> List[Union[List[str], Tuple[str]]]:
+    """ Eager counterpart of `iter_csv_parallel`, accepts the same arguments."""
+    return list(iter_csv_parallel(path, **kwargs))
+
+def iter_csv_parallel(
+    path: Union[str, Path],
+    delimiter: str = ',',
+    encoding: str = 'utf-8',
+    drop: bool = False,
+    skip_header: bool = False,
+    dedup: Union[bool, str] = False,
+    ordered: bool = True,
+    workers: Optional[int] = None,
+    chunk_size: int = PARALLEL_CHUNK_SIZE,
+    **kwargs
+) -> Iterator[Union[List[str], Tuple[str]]]:
+    """
+    Parses a CSV file in a process pool, splitting it into newline aligned byte ranges.
+
+    Each range is parsed by its own process, at most twice as many ranges as workers are
+    in flight, so memory stays bounded by the chunk size. Rows are split on raw newlines,
+    so quoted fields must not contain line breaks.
+
+    Args:
+        path (Union[str, Path]): The file path to the CSV file.
+        delimiter (str, optional): The character used to separate fields. Defaults to ','.
+        encoding (str, optional): Encoding of the file, must encode newlines as a single b'\\n'. Defaults to 'utf-8'.
+        drop (bool, optional): If True, strips whitespace from each field and drops duplicated rows. Defaults to False.
+        skip_header (bool, optional): If True, skips the header row of the CSV file. Defaults to False.
+        dedup (Union[bool, str], optional): Drops duplicated rows keeping the first one yielded, see `unique_rows`. Defaults to False.
+        ordered (bool, optional): If True, yields rows in file order, otherwise
+            yields each range as soon as it is parsed. Defaults to True.
+        workers (Optional[int], optional): The number of processes. Defaults to the number of CPUs.
+        chunk_size (int, optional): The approximate size in bytes of each range. Defaults to `PARALLEL_CHUNK_SIZE`.
+        **kwargs: Additional format parameters passed to the `csv.reader` function.
+
+    Returns:
+        Iterator[Union[List[str], Tuple[str]]]: The rows of the file, tuples if `drop` is True.
+
+    Raises:
+        ValueError: If `encoding` is not ASCII compatible or the file is compressed.
+    """
+    if codecs.lookup(encoding).name.startswith(('utf-16', 'utf-32')):
+        raise ValueError(f'Encoding {encoding!r} cannot be split on newlines.')
+
+    if get_compression(path):
+        raise ValueError(f'Compressed files cannot be split into byte ranges: {path}')
+
+    rows = _iter_ranges(path, delimiter, encoding, drop, skip_header, ordered, workers, chunk_size, kwargs)
+
+    if drop:
+        dedup = dedup or True
+
+    if dedup:
+        rows = unique_rows(rows, dedup)
+
+    yield from rows
+
+def split_ranges(path: Union[str, Path], chunk_size: int = PARALLEL_CHUNK_SIZE) -> List[Tuple[int, int]]:
+    """ Splits a file into (start, end) byte ranges of about `chunk_size` bytes, each ending after a newline."""
+    size = os.path.getsize(path)
+    ranges = []
+    start = 0
+
+    with open(path, 'rb') as f:
+        while start < size:
+            end = start + chunk_size
+            if end < size:
+                f.seek(end)
+                f.readline()
+                end = f.tell()
+            else:
+                end = size
+            ranges.append((start, end))
+            start = end
+
+    return ranges
+
+def _iter_ranges(path, delimiter, encoding, drop, skip_header, ordered, workers, chunk_size, fmtparams) -> Iterator[List[str]]:
+    ranges = split_ranges(path, chunk_size)
+    args = lambda i: (path, *ranges[i], encoding, delimiter, drop, skip_header and i == 0, fmtparams)
+
+    if len(ranges) <= 1:
+        for i in range(len(ranges)):
+            yield from _parse_range(*args(i))
+        return
+
+    workers = workers or os.cpu_count() or 1
+    window = workers * 2
+    executor = ProcessPoolExecutor(workers)
+    try:
+        submitted = 0
+        pending = deque() if ordered else set()
+        submit = pending.append if ordered else pending.add
+
+        while submitted < len(ranges) or pending:
+            while submitted < len(ranges) and len(pending) < window:
+                submit(executor.submit(_parse_range, *args(submitted)))
+                submitted += 1
+
+            if ordered:
+                yield from pending.popleft().result()
+            else:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    pending.remove(future)
+                    yield from future.result()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+def _parse_range(path, start, end, encoding, delimiter, drop, skip_header, fmtparams) -> List[List[str]]:
+    with open(path, 'rb') as f:
+        f.seek(start)
+        text = f.read(end - start).decode(encoding)
+
+    rows = csv.reader(io.StringIO(text, newline=''), delimiter=delimiter, **fmtparams)
+    if skip_header:
+        next(rows, None)
+
+    if drop:
+        return [tuple(c.strip() for c in row) for row in rows]
+    return list(rows)
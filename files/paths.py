@@ -1,5 +1,12 @@
+import os
+from collections.abc import Iterable
+from functools import lru_cache
 from pathlib import Path
-from typing import Union
+from typing import List, Union
+
+__all__ = ['UnsafePathException', 'join_paths', 'join_paths_many', 'clear_paths_cache']
+
+PATHS_CACHE_SIZE = int(os.getenv('PATHS_CACHE_SIZE', 1024))
 
 class UnsafePathException(Exception):
     """Exception raised for unsafe paths."""
@@ -9,7 +16,8 @@ def join_paths(
     *paths: Union[str, Path], 
     check: bool = False, 
     mkdir: bool = False,
-    eafp: bool = False
+    eafp: bool = False,
+    lexical: bool = False
 ) -> Path:
     """
     Joins multiple paths into a single absolute path 
@@ -23,6 +31,8 @@ def join_paths(
         mkdir (bool, optional): If `True`, the function creates the parent directories 
             of the resolved path if they do not exist, using `Path.mkdir()`.
         EAFP (bool, optional): easier to ask forgiveness than permission
+        lexical (bool, optional): If `True`, `..` components are collapsed without touching the 
+            filesystem, which is much faster but does not follow symlinks. Defaults to `False`.
 
     Returns:
         Path: The fully joined and resolved path as a `Path` object.
@@ -41,26 +51,70 @@ def join_paths(
     if len(paths) < 1:
         raise ValueError("At least one path must be provided.")
 
-    paths = [Path(p) if isinstance(p, str) else p for p in paths]
-    base_dir = paths[0].resolve()
+    base_dir = _get_base(paths[0], lexical)
+    resolved_path = _join(base_dir, paths[1:], lexical)
+    _check_path(resolved_path, check, mkdir, eafp)
+    return resolved_path
+
+def join_paths_many(
+    base: Union[str, Path],
+    names: Iterable[Union[str, Path]],
+    check: bool = False,
+    mkdir: bool = False,
+    eafp: bool = False,
+    lexical: bool = False
+) -> List[Path]:
+    """
+    Joins every name to `base` like `join_paths(base, name)`, resolving `base` only once.
+
+    Args:
+        base (Union[str, Path]): The base directory every path must remain within.
+        names (Iterable[Union[str, Path]]): The paths to join to `base`.
+        check, mkdir, eafp, lexical: See `join_paths`.
+
+    Returns:
+        List[Path]: The joined paths, in the order of `names`.
+
+    Raises:
+        UnsafePathException: If any of the paths is outside the base directory.
+    """
+    base_dir = _get_base(base, lexical)
+    created = set()
+    paths = []
 
-    full_path = base_dir
-    for p in paths[1:]:
-        full_path = full_path / p
+    for name in names:
+        path = _join(base_dir, (name,), lexical)
+        _check_path(path, check, mkdir and path.parent not in created, eafp)
+        if mkdir:
+            created.add(path.parent)
+        paths.append(path)
 
-    resolved_path = full_path.resolve()
+    return paths
+
+def clear_paths_cache() -> None:
+    """ Forgets the resolved base directories, needed if a base directory or symlink was moved."""
+    _resolve_base.cache_clear()
+
+@lru_cache(maxsize=PATHS_CACHE_SIZE)
+def _resolve_base(path: str) -> Path:
+    return Path(path).resolve()
+
+def _get_base(path: Union[str, Path], lexical: bool) -> Path:
+    path = os.path.join(os.getcwd(), path)
+    return Path(os.path.normpath(path)) if lexical else _resolve_base(path)
+
+def _join(base_dir: Path, paths: Iterable[Union[str, Path]], lexical: bool) -> Path:
+    full_path = base_dir.joinpath(*paths)
+    resolved_path = Path(os.path.normpath(full_path)) if lexical else full_path.resolve()
 
     if not resolved_path.is_relative_to(base_dir):
         raise UnsafePathException(f"The path {resolved_path} is outside the safe directory {base_dir}.")
 
+    return resolved_path
+
+def _check_path(resolved_path: Path, check: bool, mkdir: bool, eafp: bool) -> None:
     if check and not resolved_path.exists():
         raise FileNotFoundError(f"The path {resolved_path} does not exist")
 
     elif mkdir and (not eafp or resolved_path.parent.exists()):
         resolved_path.parent.mkdir(parents=True, exist_ok=True)
-
-    return resolved_path
-
-
-
-
@@ -1,42 +1,193 @@
 from pathlib import Path
 import io
+import os
+from collections import deque
+from collections.abc import AsyncIterator, Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Any
 from.io import write
+from.aio import _aiter
 from PIL import Image
 
 def realize_image(
     photo: str|bytes|Path,
-    width: int, 
-    height: int, 
+    width: int|None = None, 
+    height: int|None = None, 
     mode: str = 'RGB',
     remove_original: bool = True,
-    new_path: str|Path|None = None, 
-    ignore_errors=False
-) -> Path|bytes|None:
+    new_path: str|Path|list[str|Path]|None = None, 
+    ignore_errors=False,
+    sizes: list[tuple[int|None, int|None]]|None = None
+) -> Path|bytes|list[Path|bytes]|None:
+    """
+    Converts and resizes an image, decoding it only once and at the smallest scale that is large enough.
+
+    JPEG images are decoded with `draft`, which downscales by up to 8x inside the decoder,
+    other formats are shrunk with a fast box `reduce` before the final resample.
+
+    Args:
+        photo (str|bytes|Path): The image file or its content.
+        width (int|None, optional): The new width, proportional to `height` if None. Defaults to None.
+        height (int|None, optional): The new height, proportional to `width` if None. Defaults to None.
+        mode (str, optional): The mode to convert the image to. Defaults to 'RGB'.
+        remove_original (bool, optional): If True and `photo` is a file, it is replaced by the new image,
+            or removed once written to `new_path`. Defaults to True.
+        new_path (str|Path|list[str|Path]|None, optional): Where to write the image, one path per size
+            or a template with {width} and {height} when `sizes` is given. Defaults to None.
+        ignore_errors (bool, optional): If True, returns None instead of raising. Defaults to False.
+        sizes (list[tuple[int|None, int|None]]|None, optional): Several (width, height) targets
+            produced from the same decode, used instead of `width` and `height`. Defaults to None.
+
+    Returns:
+        Path|bytes|list[Path|bytes]|None: The written path or the image bytes, a list of them if `sizes` is given.
+    """
     try:
-        with Image.open(photo) as image:
-            img = image.convert(mode).resize((width, height))
-            format_img = Path(new_path).suffix if new_path else image.format or 'PNG'
-
-            img_file = io.BytesIO()
-            img.save(img_file, format=format_img) 
-            img_file.seek(0)
-            img_bytes = img_file.getvalue()
-
-        if new_path:
-            result = write(new_path, img_bytes, binary=True)
-        elif isinstance(photo, (str,Path)) and remove_original:
-            result =  write(photo, img_bytes, binary=True)
-        else:
-            result = img_bytes
-
-        if remove_original and isinstance(photo, (str, Path)):
+        is_file = not isinstance(photo, (bytes, bytearray, memoryview))
+        source = photo if is_file else io.BytesIO(photo)
+        targets = sizes or [(width, height)]
+
+        results = []
+        with Image.open(source) as image:
+            format_img = image.format or 'PNG'
+            targets = [_target_size(image.size, w, h) for w, h in targets]
+            paths = _get_paths(new_path, targets) if sizes else [new_path]
+            image.draft(mode, (max(w for w, _ in targets), max(h for _, h in targets)))
+            img = image.convert(mode)
+
+            for size, path in zip(targets, paths):
+                img_bytes = _save(_resize(img, size), _get_format(path) if path else format_img)
+
+                if path:
+                    results.append(write(path, img_bytes, binary=True))
+                elif is_file and remove_original and not sizes:
+                    results.append(write(photo, img_bytes, binary=True, atomic=True))
+                else:
+                    results.append(img_bytes)
+
+        if remove_original and is_file and new_path and Path(photo).resolve() not in {Path(p).resolve() for p in paths}:
             Path(photo).unlink()
 
-        return result
+        return results if sizes else results[0]
 
     except Exception as e:
         if not ignore_errors:
             raise e
         return None
 
+def realize_images(
+    photos: Iterable[str|bytes|Path],
+    width: int|None = None,
+    height: int|None = None,
+    ordered: bool = True,
+    workers: int|None = None,
+    return_exceptions: bool = False,
+    **kwargs: Any
+) -> Iterator[Path|bytes|None|Exception|tuple[int, Path|bytes|None|Exception]]:
+    """
+    Runs `realize_image` over many photos in a process pool.
+
+    Photos are pulled lazily, at most twice as many as workers are in flight,
+    so any iterable, even an endless one, can be streamed through the pool.
+
+    Args:
+        photos (Iterable[str|bytes|Path]): The photos, as accepted by `realize_image`.
+        width (int|None, optional): The width of the new images. Defaults to None.
+        height (int|None, optional): The height of the new images. Defaults to None.
+        ordered (bool, optional): If True, yields results in input order, otherwise yields
+            (index, result) tuples as soon as each photo is done. Defaults to True.
+        workers (int|None, optional): The number of processes. Defaults to the number of CPUs.
+        return_exceptions (bool, optional): If True, the exception raised by a photo is yielded
+            as its result instead of stopping the batch. Defaults to False.
+        **kwargs: Additional arguments passed to `realize_image`, `ignore_errors=True` yields None for failed photos.
+
+    Returns:
+        Iterator: The result of every photo, or (index, result) tuples if `ordered` is False.
+    """
+    workers = workers or os.cpu_count() or 1
+    window = workers * 2
+    photos = enumerate(photos)
+    pending = deque() if ordered else {}
+    executor = ProcessPoolExecutor(workers)
+
+    def submit() -> bool:
+        for index, photo in photos:
+            future = executor.submit(_realize_item, photo, width, height, return_exceptions, kwargs)
+            if ordered:
+                pending.append(future)
+            else:
+                pending[future] = index
+            return True
+        return False
+
+    try:
+        while len(pending) < window and submit():
+            pass
+
+        while pending:
+            if ordered:
+                result = pending.popleft().result()
+                submit()
+                yield result
+            else:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = pending.pop(future)
+                    submit()
+                    yield index, future.result()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+def arealize_images(photos: Iterable[str|bytes|Path], width: int|None = None, height: int|None = None, **kwargs: Any) -> AsyncIterator[Any]:
+    """ Async counterpart of `realize_images`, waits for each result in a thread so the event loop is never blocked."""
+    return _aiter(realize_images(photos, width, height, **kwargs), 1)
+
+def _realize_item(photo, width, height, return_exceptions, kwargs):
+    try:
+        return realize_image(photo, width, height, **kwargs)
+    except Exception as e:
+        if not return_exceptions:
+            raise
+        return e
+
+def _target_size(size: tuple[int, int], width: int|None, height: int|None) -> tuple[int, int]:
+    if width and height:
+        return width, height
+    if width:
+        return width, max(round(size[1] * width / size[0]), 1)
+    if height:
+        return max(round(size[0] * height / size[1]), 1), height
+    return size
+
+def _resize(img: Image.Image, size: tuple[int, int]) -> Image.Image:
+    if img.size == size:
+        return img
+    factor = min(img.width // size[0], img.height // size[1])
+    if factor >= 2:
+        img = img.reduce(factor)
+    return img.resize(size)
+
+def _get_paths(new_path: str|Path|list[str|Path]|None, sizes: list[tuple[int, int]]) -> list[str|Path|None]:
+    if isinstance(new_path, (list, tuple)):
+        if len(new_path) != len(sizes):
+            raise ValueError('new_path must have one path per size.')
+        return list(new_path)
+
+    if not new_path:
+        return [None] * len(sizes)
+
+    paths = [str(new_path).format(width=w, height=h) for w, h in sizes]
+    if len(set(paths)) < len(paths):
+        raise ValueError('new_path must be a list or contain {width} and {height} when several sizes are given.')
+    return paths
+
+def _get_format(path: str|Path) -> str:
+    suffix = Path(path).suffix.lower()
+    format_img = Image.registered_extensions().get(suffix)
+    if not format_img:
+        raise ValueError(f'Unknown image format for {path}')
+    return format_img
 
+def _save(img: Image.Image, format_img: str) -> bytes:
+    img_file = io.BytesIO()
+    img.save(img_file, format=format_img)
+    return img_file.getvalue()
@@ -0,0 +1,135 @@
+import csv
+import io
+import json
+import os
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from .io import read, write
+from .compression import get_compression
+
+__all__ = ['CsvTailer']
+
+TAIL_READ_SIZE = int(os.getenv('TAIL_READ_SIZE', 4 * 1024 * 1024))
+
+class CsvTailer:
+    """
+    Incremental reader that yields only the CSV rows appended since the last checkpoint.
+
+    The checkpoint stores the byte offset, device and inode of the file and is saved
+    atomically next to it (`<path>.offset` by default) after each poll. Only complete
+    records are consumed, like `CsvIndex.build` the rows are parsed line by line so a quoted
+    field with line breaks is never split, and a partially written last row (or one whose
+    quote is still open) is read again on the next poll.
+    A smaller file means it was truncated and a different inode that it was rotated,
+    both restart from the beginning of the current file.
+
+        tailer = CsvTailer('leads.csv', skip_header=True)
+        for row in tailer.poll():
+            ...
+    """
+    def __init__(
+        self,
+        path: Union[str, Path],
+        checkpoint: Optional[Union[str, Path]] = None,
+        delimiter: str = ',',
+        encoding: str = 'utf-8',
+        skip_header: bool = False,
+        read_size: int = TAIL_READ_SIZE,
+        **kwargs
+    ) -> None:
+        if get_compression(path):
+            raise ValueError(f'Compressed files cannot be tailed: {path}')
+
+        self.path = Path(path)
+        self.checkpoint = Path(checkpoint) if checkpoint else self.path.with_name(self.path.name + '.offset')
+        self.delimiter = delimiter
+        self.encoding = encoding
+        self.skip_header = skip_header
+        self.read_size = read_size
+        self.fmtparams = kwargs
+        self.state: Dict[str, Any] = self._load()
+
+    @property
+    def offset(self) -> int:
+        return self.state['offset']
+
+    def poll(self, commit: bool = True) -> Iterator[List[str]]:
+        """
+        Yields the rows appended since the last checkpoint.
+
+        Args:
+            commit (bool, optional): If True, saves the checkpoint once every row was yielded,
+                otherwise call `commit` after processing them. Defaults to True.
+
+        Returns:
+            Iterator[List[str]]: The new rows.
+        """
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return
+
+        state = self.state
+        if (st.st_dev, st.st_ino) != (state['dev'], state['ino']) or st.st_size < state['offset']:
+            state.update(dev=st.st_dev, ino=st.st_ino, offset=0)
+
+        with open(self.path, 'rb') as f:
+            f.seek(state['offset'])
+            pending = b''
+            while data := f.read(self.read_size):
+                pending += data
+                rows, end = self._parse(pending, state['offset'] == 0)
+                if not end:
+                    continue
+
+                yield from rows
+                state['offset'] += end
+                pending = pending[end:]
+
+        if commit:
+            self.commit()
+
+    def commit(self) -> None:
+        """ Saves the current offset to the checkpoint file."""
+        write(self.checkpoint, json.dumps(self.state), atomic=True)
+
+    def reset(self) -> None:
+        """ Forgets the checkpoint, the next poll reads the whole file."""
+        self.state.update(dev=None, ino=None, offset=0)
+        self.checkpoint.unlink(missing_ok=True)
+
+    def _parse(self, data: bytes, first: bool) -> Tuple[List[List[str]], int]:
+        """ Returns the complete records of `data` and the byte offset where the last one ends."""
+        pos = end = 0
+        eof = False
+
+        def lines():
+            nonlocal pos, eof
+            for raw in io.BytesIO(data):
+                if not raw.endswith(b'\n'):
+                    break
+                pos += len(raw)
+                yield raw.decode(self.encoding)
+            eof = True
+
+        rows = []
+        try:
+            for row in csv.reader(lines(), delimiter=self.delimiter, **self.fmtparams):
+                if eof:
+                    break
+                rows.append(row)
+                end = pos
+        except csv.Error:
+            if not eof:
+                raise
+
+        if first and self.skip_header and rows:
+            del rows[0]
+        return rows, end
+
+    def _load(self) -> Dict[str, Any]:
+        if text := read(self.checkpoint, ignore_errors=True):
+            return json.loads(text)
+        return {'dev': None, 'ino': None, 'offset': 0}
@@ -0,0 +1,232 @@
+import errno
+import os
+import shutil
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from collections.abc import Iterable
+from pathlib import Path
+from typing import List, Optional, Union
+
+from .paths import join_paths
+from..miscellaneous import os_is_linux
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+__all__ = ['copy', 'move', 'copy_many', 'copy_tree']
+
+COPY_WORKERS = int(os.getenv('COPY_WORKERS', 8))
+FICLONE = 0x40049409
+_COPY_CHUNK = 1 << 30
+_FALLBACK_ERRORS = {errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.ENOTSUP, errno.EBADF, errno.ETXTBSY, errno.EPERM}
+
+def copy(
+    src: Union[str, Path],
+    dst: Union[str, Path],
+    base: Optional[Union[str, Path]] = None,
+    preserve: bool = True,
+    overwrite: bool = True,
+) -> Path:
+    """
+    Copies a file inside the kernel, without moving its bytes through Python.
+
+    On Linux it tries a reflink (FICLONE), then `os.copy_file_range`, then `os.sendfile`,
+    other systems use `shutil.copyfile`, which picks the native fast path.
+
+    Args:
+        src (Union[str, Path]): The file to copy.
+        dst (Union[str, Path]): The destination file, or directory to copy into.
+        base (Optional[Union[str, Path]], optional): If given, `dst` is joined to it with
+            `join_paths` and must stay inside it. Defaults to None.
+        preserve (bool, optional): If True, copies permissions and timestamps too. Defaults to True.
+        overwrite (bool, optional): If False, raises `FileExistsError` if the destination exists. Defaults to True.
+
+    Returns:
+        Path: The path of the copy.
+
+    Raises:
+        UnsafePathException: If `dst` is outside `base`.
+        shutil.SameFileError: If `dst` is `src` itself.
+    """
+    src = Path(src)
+    dst = _get_destination(src, dst, base)
+
+    if dst.exists():
+        if os.path.samefile(src, dst):
+            raise shutil.SameFileError(f'{src} and {dst} are the same file')
+        if not overwrite:
+            raise FileExistsError(f'File exists: {dst}')
+
+    if os_is_linux():
+        with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+            _copy_fd(fsrc.fileno(), fdst.fileno(), os.fstat(fsrc.fileno()).st_size)
+    else:
+        shutil.copyfile(src, dst)
+
+    if preserve:
+        shutil.copystat(src, dst)
+
+    return dst
+
+def move(
+    src: Union[str, Path],
+    dst: Union[str, Path],
+    base: Optional[Union[str, Path]] = None,
+    overwrite: bool = True,
+) -> Path:
+    """
+    Moves a file with a rename, falling back to `copy` and unlink across filesystems.
+
+    Args:
+        src (Union[str, Path]): The file to move.
+        dst (Union[str, Path]): The destination file, or directory to move into.
+        base (Optional[Union[str, Path]], optional): If given, `dst` must stay inside it. Defaults to None.
+        overwrite (bool, optional): If False, raises `FileExistsError` if the destination exists. Defaults to True.
+
+    Returns:
+        Path: The new path of the file.
+    """
+    src = Path(src)
+    dst = _get_destination(src, dst, base)
+
+    if not overwrite and dst.exists():
+        raise FileExistsError(f'File exists: {dst}')
+
+    try:
+        os.replace(src, dst)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        copy(src, dst)
+        src.unlink()
+
+    return dst
+
+def copy_many(
+    paths: Iterable[Union[str, Path]],
+    directory: Union[str, Path],
+    workers: int = COPY_WORKERS,
+    move_files: bool = False,
+    **kwargs
+) -> List[Path]:
+    """
+    Copies (or moves) many files into `directory` using a thread pool.
+
+    Args:
+        paths (Iterable[Union[str, Path]]): The files to copy.
+        directory (Union[str, Path]): The directory to copy them into, kept as `base`,
+            so no file can land outside it.
+        workers (int, optional): The number of threads. Defaults to `COPY_WORKERS`.
+        move_files (bool, optional): If True, moves the files instead. Defaults to False.
+        **kwargs: Additional arguments passed to `copy` or `move`.
+
+    Returns:
+        List[Path]: The new paths, in the order of `paths`.
+
+    Raises:
+        ValueError: If two files have the same name, they would be written to the same destination.
+    """
+    func = move if move_files else copy
+    paths = [Path(path) for path in paths]
+
+    names = Counter(path.name for path in paths)
+    if duplicates := sorted(name for name, count in names.items() if count > 1):
+        raise ValueError(f'Files with the same name would overwrite each other: {duplicates}')
+
+    Path(directory).mkdir(parents=True, exist_ok=True)
+
+    with ThreadPoolExecutor(workers) as executor:
+        futures = [executor.submit(func, path, path.name, base=directory, **kwargs) for path in paths]
+        return [future.result() for future in futures]
+
+def copy_tree(
+    src: Union[str, Path],
+    dst: Union[str, Path],
+    base: Optional[Union[str, Path]] = None,
+    workers: int = COPY_WORKERS,
+    **kwargs
+) -> List[Path]:
+    """
+    Copies a directory tree, copying its files in a thread pool. Symlinks are copied as links.
+
+    Args:
+        src (Union[str, Path]): The directory to copy.
+        dst (Union[str, Path]): The destination directory, created if missing.
+        base (Optional[Union[str, Path]], optional): If given, `dst` must stay inside it. Defaults to None.
+        workers (int, optional): The number of threads. Defaults to `COPY_WORKERS`.
+        **kwargs: Additional arguments passed to `copy`.
+
+    Returns:
+        List[Path]: The paths of the copied files.
+    """
+    src = Path(src)
+    dst = join_paths(base, dst) if base else Path(dst)
+
+    with ThreadPoolExecutor(workers) as executor:
+        futures = []
+        for root, dirs, files in os.walk(src):
+            target = dst / Path(root).relative_to(src)
+            target.mkdir(parents=True, exist_ok=True)
+
+            for name in dirs + files:
+                path = Path(root, name)
+                if path.is_symlink():
+                    (target / name).unlink(missing_ok=True)
+                    os.symlink(os.readlink(path), target / name)
+                elif name in files:
+                    futures.append(executor.submit(copy, path, target / name, **kwargs))
+
+            dirs[:] = [d for d in dirs if not Path(root, d).is_symlink()]
+
+        return [future.result() for future in futures]
+
+def _get_destination(src: Path, dst: Union[str, Path], base: Optional[Union[str, Path]]) -> Path:
+    dst = join_paths(base, dst, mkdir=True) if base else Path(dst)
+    return dst / src.name if dst.is_dir() else dst
+
+def _copy_fd(fd_in: int, fd_out: int, size: int) -> None:
+    """ Copies `size` bytes with the fastest mechanism the kernel accepts, resuming where the last one stopped."""
+    if fcntl and size:
+        try:
+            fcntl.ioctl(fd_out, FICLONE, fd_in)
+            return
+        except OSError as e:
+            if e.errno not in _FALLBACK_ERRORS and e.errno != errno.ENOTTY:
+                raise
+
+    offset = 0
+    for method in (_copy_file_range, _sendfile):
+        try:
+            offset = method(fd_in, fd_out, offset, size)
+            if offset >= size:
+                return
+        except OSError as e:
+            if e.errno not in _FALLBACK_ERRORS:
+                raise
+
+    os.lseek(fd_in, offset, os.SEEK_SET)
+    os.lseek(fd_out, offset, os.SEEK_SET)
+    with open(fd_in, 'rb', closefd=False) as fsrc, open(fd_out, 'wb', closefd=False) as fdst:
+        shutil.copyfileobj(fsrc, fdst, 1024 * 1024)
+
+def _copy_file_range(fd_in: int, fd_out: int, offset: int, size: int) -> int:
+    if not hasattr(os, 'copy_file_range'):
+        return offset
+
+    while offset < size:
+        sent = os.copy_file_range(fd_in, fd_out, min(size - offset, _COPY_CHUNK), offset, offset)
+        if not sent:
+            break
+        offset += sent
+    return offset
+
+def _sendfile(fd_in: int, fd_out: int, offset: int, size: int) -> int:
+    os.lseek(fd_out, offset, os.SEEK_SET)
+    while offset < size:
+        sent = os.sendfile(fd_out, fd_in, offset, min(size - offset, _COPY_CHUNK))
+        if not sent:
+            break
+        offset += sent
+    return offset
@@ -0,0 +1,270 @@
+import csv
+import io
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any, Optional, Union
+
+from .aio import run_io
+from .compression import open_file, get_compression
+from .paths import join_paths
+
+__all__ = ['CsvAppender', 'PartitionedWriter']
+
+APPEND_MAX_ROWS = int(os.getenv('APPEND_MAX_ROWS', 1000))
+APPEND_MAX_SIZE = int(os.getenv('APPEND_MAX_SIZE', 1024 * 1024))
+APPEND_MAX_DELAY = float(os.getenv('APPEND_MAX_DELAY', 1))
+PARTITION_BUFFER_SIZE = int(os.getenv('PARTITION_BUFFER_SIZE', 64 * 1024))
+
+class CsvAppender:
+    """
+    Long-lived CSV writer that keeps one handle open and buffers rows in memory.
+
+    The buffer is written to the file once it holds `max_rows` rows or `max_size` characters,
+    `max_delay` seconds after the first buffered row, and on close. Rows are serialized whole
+    under a lock, so concurrent coroutines and threads never interleave their fields.
+
+        async with CsvAppender('results.csv', header=['phone', 'status']) as out:
+            await runner.run()  # tasks call out.append([phone, status])
+    """
+    def __init__(
+        self,
+        path: Union[str, Path],
+        header: Optional[Iterable[str]] = None,
+        mode: str = 'a',
+        delimiter: str = ',',
+        encoding: str = 'utf-8',
+        newline: str = '',
+        max_rows: int = APPEND_MAX_ROWS,
+        max_size: int = APPEND_MAX_SIZE,
+        max_delay: Optional[float] = APPEND_MAX_DELAY,
+        **kwargs
+    ) -> None:
+        self.path = Path(path)
+        self.max_rows = max_rows
+        self.max_size = max_size
+        self.max_delay = max_delay
+        new_file = 'w' in mode or not self.path.exists() or self.path.stat().st_size == 0
+        self._file = open_file(path, mode, encoding=encoding, newline=newline, **kwargs)
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer, delimiter=delimiter)
+        self._rows = 0
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+
+        if header and new_file:
+            self._writer.writerow(header)
+
+    @property
+    def closed(self) -> bool:
+        return self._file.closed
+
+    def __len__(self) -> int:
+        """ Number of rows waiting in the buffer."""
+        return self._rows
+
+    def append(self, row: Iterable[str]) -> None:
+        """ Buffers a row, flushing if a threshold is reached."""
+        if self._buffer_rows((row,)):
+            self.flush()
+
+    def append_many(self, rows: Iterable[Iterable[str]]) -> None:
+        """ Buffers many rows at once, flushing if a threshold is reached."""
+        if self._buffer_rows(rows):
+            self.flush()
+
+    async def aappend(self, row: Iterable[str]) -> None:
+        """ Like `append`, but flushes in the files I/O thread pool instead of the event loop."""
+        if self._buffer_rows((row,)):
+            await self.aflush()
+
+    async def aappend_many(self, rows: Iterable[Iterable[str]]) -> None:
+        """ Like `append_many`, but flushes in the files I/O thread pool instead of the event loop."""
+        if self._buffer_rows(rows):
+            await self.aflush()
+
+    def flush(self) -> None:
+        """ Writes the buffered rows to the file."""
+        with self._write_lock:
+            with self._lock:
+                data = self._take()
+
+            if data and not self._file.closed:
+                self._file.write(data)
+                self._file.flush()
+
+    async def aflush(self) -> None:
+        await run_io(self.flush)
+
+    def close(self) -> None:
+        """ Flushes the buffer and closes the file."""
+        with self._write_lock:
+            if self._file.closed:
+                return
+            with self._lock:
+                data = self._take()
+            if data:
+                self._file.write(data)
+            self._file.close()
+
+    async def aclose(self) -> None:
+        await run_io(self.close)
+
+    def __enter__(self) -> 'CsvAppender':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    async def __aenter__(self) -> 'CsvAppender':
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.aclose()
+
+    def _buffer_rows(self, rows: Iterable[Iterable[str]]) -> bool:
+        """ Serializes the rows into the buffer, returns True if it must be flushed."""
+        with self._lock:
+            if self._file.closed:
+                raise ValueError(f'CsvAppender for {self.path} is closed.')
+
+            for row in rows:
+                self._writer.writerow(row)
+                self._rows += 1
+
+            return self._is_full()
+
+    def _is_full(self) -> bool:
+        if self._rows >= self.max_rows or self._buffer.tell() >= self.max_size:
+            return True
+
+        if self._timer is None and self.max_delay is not None:
+            self._timer = threading.Timer(self.max_delay, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+        return False
+
+    def _take(self) -> str:
+        data = self._buffer.getvalue()
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        self._rows = 0
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+        return data
+
+
+class PartitionedWriter:
+    """
+    Fans rows out to one CSV file per partition key, keeping an LRU of open buffered handles.
+
+    The file of each key is `join_paths(directory, name.format(key=key))`, so keys cannot
+    escape `directory`. At most `max_open` handles stay open, the least recently used one is
+    flushed and closed to make room, and reopened in append mode when its key shows up again.
+
+        with PartitionedWriter('groups', header=['user_id', 'username']) as out:
+            for group, user in members:
+                out.write(group, [user.id, user.username])
+    """
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        name: str = '{key}.csv',
+        header: Optional[Iterable[str]] = None,
+        mode: str = 'a',
+        delimiter: str = ',',
+        encoding: str = 'utf-8',
+        newline: str = '',
+        max_open: Optional[int] = None,
+        buffer_size: int = PARTITION_BUFFER_SIZE,
+        **kwargs
+    ) -> None:
+        self.directory = Path(directory)
+        self.name = name
+        self.header = list(header) if header else None
+        self.mode = mode
+        self.delimiter = delimiter
+        self.max_open = max_open or _default_max_open()
+        self.buffer_size = buffer_size
+        self.open_kwargs = dict(encoding=encoding, newline=newline, **kwargs)
+        self._handles: OrderedDict = OrderedDict()
+        self._opened = set()
+        self._paths = {}
+        self._lock = threading.Lock()
+
+    @property
+    def open_files(self) -> int:
+        return len(self._handles)
+
+    def path(self, key: Any) -> Path:
+        """ Returns the file path of a partition."""
+        return join_paths(self.directory, self.name.format(key=key), mkdir=True)
+
+    def write(self, key: Any, row: Iterable[str]) -> None:
+        """ Appends a row to the file of `key`."""
+        with self._lock:
+            self._get_writer(key).writerow(row)
+
+    def write_many(self, key: Any, rows: Iterable[Iterable[str]]) -> None:
+        """ Appends many rows to the file of `key`."""
+        with self._lock:
+            self._get_writer(key).writerows(rows)
+
+    def flush(self) -> None:
+        """ Flushes every open handle."""
+        with self._lock:
+            for f, _ in self._handles.values():
+                f.flush()
+
+    def close(self) -> None:
+        """ Flushes and closes every open handle."""
+        with self._lock:
+            while self._handles:
+                _, (f, _) = self._handles.popitem(last=False)
+                f.close()
+
+    def __enter__(self) -> 'PartitionedWriter':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def _get_writer(self, key: Any):
+        """ Handles are keyed by file path, so keys such as 1 and '1' share the same handle."""
+        path = self._paths.get(key)
+        if path is None:
+            path = self._paths[key] = self.path(key)
+
+        if handle := self._handles.get(path):
+            self._handles.move_to_end(path)
+            return handle[1]
+
+        while len(self._handles) >= self.max_open:
+            _, (f, _) = self._handles.popitem(last=False)
+            f.close()
+
+        mode = self.mode if path not in self._opened else 'a'
+        new_file = 'w' in mode or not path.exists() or path.stat().st_size == 0
+
+        buffering = {} if get_compression(path) else {'buffering': self.buffer_size}
+        f = open_file(path, mode, **buffering, **self.open_kwargs)
+        writer = csv.writer(f, delimiter=self.delimiter)
+        if self.header and new_file:
+            writer.writerow(self.header)
+
+        self._opened.add(path)
+        self._handles[path] = (f, writer)
+        return writer
+
+def _default_max_open() -> int:
+    """ A quarter of the soft limit of open files, so other handles of the process still fit."""
+    try:
+        import resource
+        soft, _ = resource.getrlimit(resource.RLIMIT_NOFILE)
+        return max(1, min(soft // 4, 1024))
+    except (ImportError, ValueError):
+        return 128
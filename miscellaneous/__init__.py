@@ -1,4 +1,5 @@
 from.async_utils import *
+from.rate_limit import *
 from.os_utils import *
 from.utils import *
 from.decorators import ensure, singleton
@@ -2,18 +2,23 @@ import logging
 import asyncio
 import random
 import os
+import pickle
+import tempfile
 import warnings
-from typing import List, Optional, Union, Any
-from collections.abc import AsyncIterable, Coroutine, Iterable, Callable, Awaitable
+from collections import deque
+from typing import Deque, List, Optional, Set, Union, Any
+from collections.abc import AsyncIterable, AsyncIterator, Coroutine, Iterable, Iterator, Callable, Awaitable
 
 from .os_utils import *
 from .utils import *
 from .decorators import ensure
+from .rate_limit import RateLimiter
 
-__all__ = ['sleep', 'run_async', 'Runner', 'get_loop', 'get_runner', 'set_loop']
+__all__ = ['sleep', 'run_async', 'iter_async', 'Runner', 'SpillSink', 'get_loop', 'get_runner', 'set_loop']
 
 DELAY = float (os.getenv('DELAY', 1))
 DELAY_FACTOR = int(os.getenv('DELAY_FACTOR', 10))
+FEED_MAX_TASKS = int(os.getenv('FEED_MAX_TASKS', 100))
 
 async def sleep(delay: float|int = DELAY, factor: int = DELAY_FACTOR) -> None:
     """ Sleeps for a random time in average delay seconds if delay is not None and > 0"""
@@ -28,8 +33,18 @@ async def run_async(
     func: Callable[..., Coroutine[Any, Any, Any]], 
     parallel: bool = True, 
     return_exceptions: bool = True,
+    concurrency: Optional[int] = None,
+    ordered: bool = True,
     **kwargs: Any
 ) -> Awaitable[Any]:
+    """
+    Awaits `func(item, **kwargs)` for every item, all at once if `parallel` or one by one.
+
+    With `concurrency`, sync and async iterables alike run through `iter_async`, at most
+    `concurrency` calls at a time, and the results are returned as a list, see `iter_async`.
+    """
+    if concurrency:
+        return [r async for r in iter_async(iterable, func, concurrency, ordered, return_exceptions, **kwargs)]
 
     if check_async_iterable(iterable):
         async for item in iterable:
@@ -45,6 +60,93 @@ async def run_async(
         for item in convert_iter(iterable):
             await func(item, **kwargs)
 
+async def iter_async(
+    iterable: Iterable | AsyncIterable,
+    func: Callable[..., Coroutine[Any, Any, Any]],
+    concurrency: int = FEED_MAX_TASKS,
+    ordered: bool = True,
+    return_exceptions: bool = True,
+    **kwargs: Any
+) -> AsyncIterator[Any]:
+    """
+    Yields `await func(item, **kwargs)` for every item, running at most `concurrency` calls at a time.
+
+    Items are pulled lazily from the (async) iterable whenever a call finishes, so memory
+    stays bounded by `concurrency` whatever the number of items. Any iterable (list, range,
+    generator, map, file...) is iterated like `Runner.feed` does, only a str, bytes or
+    non-iterable value is treated as a single item.
+
+    Args:
+        iterable (Iterable | AsyncIterable): The items.
+        func (Callable[..., Coroutine[Any, Any, Any]]): The coroutine function called with each item.
+        concurrency (int, optional): The maximum number of calls in flight. Defaults to `FEED_MAX_TASKS`.
+        ordered (bool, optional): If True, yields results in input order, otherwise yields
+            (index, result) tuples as soon as each call finishes. Defaults to True.
+        return_exceptions (bool, optional): If True, the exception raised by an item is yielded
+            as its result, otherwise it is raised and the other calls are cancelled. Defaults to True.
+        **kwargs: Additional arguments passed to `func`.
+
+    Returns:
+        AsyncIterator[Any]: The results, or (index, result) tuples if `ordered` is False.
+    """
+    if isinstance(iterable, (str, bytes)) or not isinstance(iterable, (Iterable, AsyncIterable)):
+        iterable = [iterable]
+
+    items = _aiterate(iterable).__aiter__()
+    pending = {}
+    buffer = {}
+    submitted = yielded = 0
+    exhausted = False
+
+    try:
+        while True:
+            while not exhausted and len(pending) < concurrency and submitted - yielded < concurrency * 2:
+                try:
+                    item = await items.__anext__()
+                except StopAsyncIteration:
+                    exhausted = True
+                    break
+                pending[asyncio.ensure_future(func(item, **kwargs))] = submitted
+                submitted += 1
+
+            if not pending:
+                return
+
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                index = pending.pop(task)
+                if task.exception() is None:
+                    result = task.result()
+                elif return_exceptions:
+                    result = task.exception()
+                else:
+                    raise task.exception()
+
+                if ordered:
+                    buffer[index] = result
+                else:
+                    yielded += 1
+                    yield index, result
+
+            while ordered and yielded in buffer:
+                yield buffer.pop(yielded)
+                yielded += 1
+    finally:
+        for task in pending:
+            task.cancel()
+        await items.aclose()
+
+async def _aiterate(iterable: Iterable | AsyncIterable) -> AsyncIterable:
+    if check_async_iterable(iterable):
+        async for item in iterable:
+            yield item
+    else:
+        for item in iterable:
+            yield item
+
+def _close(item: Any) -> None:
+    if asyncio.iscoroutine(item):
+        item.close()
 
 def set_loop() -> None:
     if os_is_linux():
@@ -70,6 +172,8 @@ def get_loop() -> asyncio.AbstractEventLoop:
 FatalException = (SystemExit, asyncio.CancelledError, KeyboardInterrupt)
 
 class Runner:
+    finish_delay: float = 0.1
+
     def __init__(
         self, 
         coros: List[asyncio.Future]|asyncio.Future = [], 
@@ -80,12 +184,15 @@ class Runner:
         loop: Optional[asyncio.AbstractEventLoop] = None, 
         timout: Optional[float] = None, 
         return_exceptions: bool = False, 
-        delay: Optional[Union[float, int]] = None
+        delay: Optional[Union[float, int]] = None,
+        sink: Optional[Union[Callable[[Any], Any], asyncio.Queue]] = None,
+        rate_limiter: Optional[RateLimiter] = None
     ) -> None:
         self.name: str = name
-        self.raise_fatal_exceptions: bool = raise_fatal_exceptions,
-        self._tasks: List[asyncio.Future] = []
-        self._results: List[Any] = []
+        self.raise_fatal_exceptions: bool = raise_fatal_exceptions
+        self._tasks: Set[asyncio.Future] = set()
+        self._feeders: Set[asyncio.Future] = set()
+        self._results: Deque[Any] = deque()
         self.logger: Optional[logging.Logger] = logger
         self._sem: Optional[asyncio.Semaphore] = None
         self._cancel_running = False
@@ -94,7 +201,9 @@ class Runner:
         self.future: asyncio.Future = self.loop.create_future()
         self.timout: Optional[float] = timout
         self.delay: Optional[Union[float, int]] = delay
+        self.rate_limiter: Optional[RateLimiter] = rate_limiter
         self.return_exceptions: bool = return_exceptions
+        self.sink: Optional[Union[Callable[[Any], Any], asyncio.Queue]] = sink
         for coro in to_list(coros):
             self.push(coro)
 
@@ -128,6 +237,7 @@ class Runner:
 
     @max_tasks.setter
     def max_tasks(self, max_tasks: int):
+        self._max_tasks = max_tasks
         if not self._sem:
             self._sem = asyncio.Semaphore(max_tasks) if max_tasks else None
         elif max_tasks:
@@ -149,8 +259,8 @@ class Runner:
     @property
     def results(self):
         results = []
-        while len (self._results) > 0:
-            results.append(self._results.pop(0))
+        while self._results:
+            results.append(self._results.popleft())
 
         return results
 
@@ -159,41 +269,107 @@ class Runner:
         try:
             if result.done():
                 result_task = result.result()
-                self._results.append(result_task)
+                self._emit(result_task)
         except FatalException as e:
             if self.raise_fatal_exceptions:
-                self._results.append(result.exception())
+                self._emit(e)
         except Exception as e:
-            self._results.append(result.exception())
+            self._emit(e)
+
+        self._tasks.discard(result)
 
-        self._tasks.remove(result)
+    def _emit(self, result: Any):
+        if self.sink is None:
+            self._results.append(result)
+        elif not isinstance(self.sink, asyncio.Queue):
+            self.sink(result)
 
     def push(self, coro):
-        async def run_coro():
-            async def _run_coro():
-                await sleep(self.delay)
-                try:
-                    return await asyncio.wait_for(coro, self.timout)
-                except asyncio.TimeoutError:
-                    pass
+        task = self.loop.create_task(self._run_coro(coro))
+        task.add_done_callback(self.on_task_done)
+        self._tasks.add(task)
+        return task
+
+    def feed(
+        self,
+        source: Iterable | AsyncIterable,
+        func: Optional[Callable[..., Coroutine[Any, Any, Any]]] = None,
+        **kwargs: Any
+    ) -> asyncio.Task:
+        """
+        Pushes work from an iterable or async iterable lazily, keeping at most `max_tasks`
+        (or `FEED_MAX_TASKS`) in flight and pulling the next item only when one finishes.
+
+        Items are passed to `func(item, **kwargs)` if given, otherwise they must be
+        coroutines or coroutine factories called without arguments. `run` waits for the source
+        to be exhausted. Returns the feeder task.
+        """
+        feeder = self.loop.create_task(self._feed(source, func, kwargs))
+        feeder.add_done_callback(self.on_feeder_done)
+        self._feeders.add(feeder)
+        return feeder
+
+    def on_feeder_done(self, feeder: asyncio.Future):
+        self._feeders.discard(feeder)
+        if not feeder.cancelled() and feeder.exception():
+            self._emit(feeder.exception())
+
+    async def _feed(self, source, func, kwargs):
+        slots = asyncio.Semaphore(self._max_tasks or FEED_MAX_TASKS)
+        release = lambda _: slots.release()
+
+        try:
+            async for item in _aiterate(source):
+                await slots.acquire()
+                if self.future.done():
+                    _close(item)
+                    break
+
+                if func:
+                    coro = func(item, **kwargs)
+                else:
+                    coro = item if asyncio.iscoroutine(item) else item()
+
+                self.push(coro).add_done_callback(release)
+        except Exception as e:
+            if isinstance(self.sink, asyncio.Queue):
+                await self.sink.put(e)
+            raise
+
+    async def _run_coro(self, coro):
+        if self._sem:
+            async with self._sem:
+                return await self._wait_coro(coro)
+        return await self._wait_coro(coro)
+
+    async def _wait_coro(self, coro):
+        if self.rate_limiter:
+            await self.rate_limiter.acquire()
+        elif self.delay:
+            await sleep(self.delay)
 
-            if self._sem:
-                async with self._sem:
-                    return await _run_coro()
+        try:
+            if self.timout is None:
+                result = await coro
             else:
-                return await _run_coro()
+                result = await asyncio.wait_for(coro, self.timout)
+        except asyncio.TimeoutError:
+            result = None
+        except Exception as e:
+            if isinstance(self.sink, asyncio.Queue):
+                await self.sink.put(e)
+            raise
 
-        task = self.loop.create_task(run_coro())
-        task.add_done_callback(self.on_task_done)
-        self._tasks.append(task)
-        return task
+        if isinstance(self.sink, asyncio.Queue):
+            await self.sink.put(result)
+        return result
 
     def on_task_done(self, finished_task: asyncio.Future):
         self.results = finished_task
 
     def on_future_done(self, future: asyncio.Future):
 
-        for task in list(self._tasks):
+        for task in [*self._feeders, *self._tasks]:
             if not task.done():
                 task.cancel()
 
@@ -208,15 +384,53 @@ class Runner:
             except Exception as e:
                 self.logger.critical(f'Error : {e}', exc_info=True)
 
+    async def as_completed(self, maxsize: Optional[int] = None) -> AsyncIterator[Any]:
+        """
+        Runs the runner and yields each result, or exception, as soon as its task finishes.
+
+        Results go through a bounded queue of `maxsize` (`max_tasks` or `FEED_MAX_TASKS` by default),
+        a finished task keeps its slot until its result is consumed, so memory stays flat.
+        Breaking out of the loop cancels the remaining tasks.
+
+            async for result in runner.as_completed():
+                ...
+        """
+        if self.sink is not None:
+            raise RuntimeError('as_completed cannot be combined with a result sink')
+
+        self.sink = queue = asyncio.Queue(maxsize or self._max_tasks or FEED_MAX_TASKS)
+        done = object()
+
+        async def drive():
+            try:
+                return await self.run()
+            finally:
+                await queue.put(done)
+
+        for result in self.results:
+            yield result
+
+        runner = self.loop.create_task(drive())
+        try:
+            while (result := await queue.get()) is not done:
+                yield result
+            await runner
+        finally:
+            self.sink = None
+            if not runner.done():
+                runner.cancel()
+                while not queue.empty():
+                    queue.get_nowait()
+
     def __await__(self):
         return self.run().__await__()
 
     async def run(self):
         self._cancel_running = False
-        tasks = self._tasks
 
         try:
-            await asyncio.gather(*tasks, return_exceptions=self.return_exceptions)
+            while self._feeders or self._tasks:
+                await asyncio.gather(*self._feeders, *self._tasks, return_exceptions=self.return_exceptions)
             self.finish("All tasks finish")
         except FatalException:
             self.finish(None)
@@ -224,25 +438,77 @@ class Runner:
             self.finish(e=e)
 
         await self.future
-        for task in list(self._tasks):
-            if not task.done():
-                await task
-            self._tasks.remove(task)
+        if self._feeders or self._tasks:
+            await asyncio.gather(*self._feeders, *self._tasks, return_exceptions=True)
 
+        results = self.results
         if self.raise_fatal_exceptions:
-            for r in self.results:
+            for r in results:
                 if isinstance(r, FatalException):
                     raise r
 
-        return self.results
+        return results
 
     def finish(self, result = None, e = None):
         if not self.future.done() and not self._cancel_running:
             if e:
-                self.loop.call_later(0.1, self.future.set_exception, e)
+                self.loop.call_later(self.finish_delay, self.future.set_exception, e)
             else:
-                self.loop.call_later(0.1, self.future.set_result, result)
+                self.loop.call_later(self.finish_delay, self.future.set_result, result)
             self._cancel_running = True
 
+class SpillSink:
+    """
+    Result sink that pickles every result to a file as it arrives, so long jobs keep flat memory.
+    Without `path` a temporary file is used and deleted on `close`, read the results before.
+
+        with SpillSink('results.pkl') as sink:
+            await Runner(coros, sink=sink).run()
+            for result in sink:
+                ...
+    """
+    def __init__(self, path: Optional[Union[str, os.PathLike]] = None) -> None:
+        self.temporary = path is None
+        if path is None:
+            fd, path = tempfile.mkstemp(prefix='runner-', suffix='.pkl')
+            os.close(fd)
+
+        self.path = path
+        self.count = 0
+        self._file = open(path, 'wb')
+
+    def __call__(self, result: Any) -> None:
+        try:
+            data = pickle.dumps(result, pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            data = pickle.dumps(repr(result), pickle.HIGHEST_PROTOCOL)
 
+        self._file.write(data)
+        self.count += 1
 
+    def __iter__(self) -> Iterator[Any]:
+        """ Yields the spilled results in completion order."""
+        if not self._file.closed:
+            self._file.flush()
+
+        with open(self.path, 'rb') as f:
+            while True:
+                try:
+                    yield pickle.load(f)
+                except EOFError:
+                    return
+
+    def __enter__(self) -> 'SpillSink':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """ Closes the file, deleting it if the sink created it as a temporary file."""
+        self._file.close()
+        if self.temporary:
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
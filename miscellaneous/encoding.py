@@ -1,27 +1,55 @@
 import unicodedata
 from pathlib import Path
-from..files import read_bin, read, write
+from..files import read_bin, read, write, MappedFile
 
 try:
     import chardet
+    from chardet.universaldetector import UniversalDetector
 except ImportError:
     chardet = None
 
+DETECT_CHUNK_SIZE = 64 * 1024
+
 def normalize_to_ascii(text):
     normalized = unicodedata.normalize('NFKD', text)
     ascii_text = ''.join(c for c in normalized if unicodedata.category(c) != 'Mn')
     return ascii_text
 
-def detect_encoding(content: str|Path|bytearray|bytes, min_condifent: float = 0.7) -> str:
+def detect_encoding(content: str|Path|bytearray|bytes|memoryview|MappedFile, min_condifent: float = 0.7) -> str:
     if not chardet:
         raise ImportError('Please install the chardet package to use this function.')
 
     if isinstance(content, (str, Path)):
-        content = read_bin(content)
+        with read_bin(content, mapped=True) as mapped:
+            return _detect_chunks(mapped.iter_chunks(DETECT_CHUNK_SIZE), min_condifent)
+
+    if isinstance(content, MappedFile):
+        return _detect_chunks(content.iter_chunks(DETECT_CHUNK_SIZE), min_condifent)
+
+    if isinstance(content, memoryview):
+        return _detect_chunks(_iter_slices(content, DETECT_CHUNK_SIZE), min_condifent)
 
     result = chardet.detect(content)
     return result['encoding'] if result['confidence'] > min_condifent else ''
 
+def _detect_chunks(chunks, min_condifent: float) -> str:
+    """ Feeds the detector chunk by chunk, stopping as soon as it is confident."""
+    detector = UniversalDetector()
+    for chunk in chunks:
+        detector.feed(bytearray(chunk))
+        if detector.done:
+            break
+
+    result = detector.close()
+    return result['encoding'] if result['confidence'] > min_condifent else ''
+
+def _iter_slices(view: memoryview, size: int):
+    """ Yields zero-copy slices of `view`, each released once the next one is requested."""
+    with view.cast('B') as data:
+        for start in range(0, len(data), size):
+            with data[start:start + size] as chunk:
+                yield chunk
+
 def recoding(file_path: str|Path, to_encoding: str = 'utf-8', min_condifent: float = 0.7):
     if encoding := detect_encoding(file_path, min_condifent):
         if data := read(file_path, encoding=encoding):
@@ -0,0 +1,109 @@
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Optional
+
+__all__ = ['RateLimiter', 'KeyedRateLimiter']
+
+class RateLimiter:
+    """
+    Asyncio rate limiter allowing `rate` acquisitions every `per` seconds, with bursts of up to `burst`.
+
+    Implemented as a GCRA (the token bucket expressed as a single theoretical arrival time),
+    so it needs no background refill and `acquire` sleeps exactly until the tokens are available.
+    Waiters are served in the order they called `acquire`.
+
+        limiter = RateLimiter(30, per=60)
+        async with limiter:
+            ...
+    """
+    def __init__(self, rate: float, burst: int = 1, per: float = 1.0) -> None:
+        _check(rate, burst, per)
+        self.rate = rate
+        self.burst = burst
+        self.per = per
+        self.interval = per / rate
+        self._tat = 0.0
+
+    async def __aenter__(self) -> 'RateLimiter':
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        pass
+
+    def try_acquire(self, n: int = 1) -> bool:
+        """ Takes `n` tokens if they are available now, returns False without waiting otherwise."""
+        now = time.monotonic()
+        tat = max(self._tat, now) + n * self.interval
+        if tat - now > self.burst * self.interval:
+            return False
+
+        self._tat = tat
+        return True
+
+    async def acquire(self, n: int = 1) -> None:
+        """
+        Takes `n` tokens, sleeping until they are available.
+
+        A cancelled wait gives its tokens back only if nobody reserved after it,
+        later waiters keep their slots so the rate is never exceeded.
+        """
+        now = time.monotonic()
+        cost = n * self.interval
+        self._tat = tat = max(self._tat, now) + cost
+        wait = tat - self.burst * self.interval - now
+
+        if wait > 0:
+            try:
+                await asyncio.sleep(wait)
+            except asyncio.CancelledError:
+                if self._tat == tat:
+                    self._tat -= cost
+                raise
+
+    def delay(self, n: int = 1) -> float:
+        """ Returns the seconds `acquire(n)` would wait now."""
+        now = time.monotonic()
+        return max(max(self._tat, now) + n * self.interval - self.burst * self.interval - now, 0.0)
+
+class KeyedRateLimiter:
+    """
+    One `RateLimiter` per key (per account, per host...), created on first use.
+
+    At most `max_keys` limiters are kept, the least recently used one is dropped first.
+
+        limiter = KeyedRateLimiter(1, burst=5)
+        await limiter.acquire(phone)
+    """
+    def __init__(self, rate: float, burst: int = 1, per: float = 1.0, max_keys: Optional[int] = 10000) -> None:
+        _check(rate, burst, per)
+        self.rate = rate
+        self.burst = burst
+        self.per = per
+        self.max_keys = max_keys
+        self._limiters: OrderedDict[Hashable, RateLimiter] = OrderedDict()
+
+    def get(self, key: Hashable) -> RateLimiter:
+        """ Returns the limiter of `key`."""
+        limiter = self._limiters.get(key)
+        if limiter is None:
+            limiter = self._limiters[key] = RateLimiter(self.rate, self.burst, self.per)
+            if self.max_keys and len(self._limiters) > self.max_keys:
+                self._limiters.popitem(last=False)
+        else:
+            self._limiters.move_to_end(key)
+        return limiter
+
+    def try_acquire(self, key: Hashable, n: int = 1) -> bool:
+        """ Takes `n` tokens of `key` if they are available now."""
+        return self.get(key).try_acquire(n)
+
+    async def acquire(self, key: Hashable, n: int = 1) -> None:
+        """ Takes `n` tokens of `key`, sleeping until they are available."""
+        await self.get(key).acquire(n)
+
+def _check(rate: float, burst: int, per: float) -> None:
+    if rate <= 0 or burst < 1 or per <= 0:
+        raise ValueError('rate and per must be positive and burst at least 1')
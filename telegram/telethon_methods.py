@@ -65,7 +65,7 @@ def get_api(
         List[Tuple(int, str)]: The API ID and API hash.
     """
     if isinstance(api, Path) or isinstance(api, str):
-        apis = read_csv(api, drop=True, skip_header=True)
+        apis = read_csv(api, drop=True, skip_header=True, cache=True)
         return [(peer[0], peer[1]) for peer in apis]
 
     if is_list_like(api):